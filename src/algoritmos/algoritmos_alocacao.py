@@ -1,7 +1,10 @@
 from typing import Optional, List
+
+import numpy as np
+
 from algoritmos.alocador_base import AlocadorBase
 from infra.grafo.grafo import Grafo
-from infra.entidades.veiculos import Veiculo
+from infra.entidades.veiculos import Veiculo, VeiculoCombustao
 from infra.entidades.pedidos import Pedido
 
 
@@ -33,37 +36,19 @@ class AlocadorSimples(AlocadorBase):
 
         origem_pedido_nome = grafo.getNodeName(pedido.origem)
 
-        for v in veiculos_disponiveis:
-            if not self._verificar_capacidade(v, pedido):
-                continue
-
-            # Só considerar veículos em andamento que passarão pela origem
-            if not self._veiculo_passa_pela_origem(v, pedido, grafo):
-                continue
-
+        # Capacidade e, para veículos em andamento, passagem pela origem
+        for v in self._filtrar_elegiveis(veiculos_disponiveis, pedido, grafo):
             # Determinar origem do veículo em nome de nó
-            if isinstance(v.localizacao_atual, str):
-                origem_veiculo_nome = v.localizacao_atual
-            else:
-                origem_veiculo_nome = grafo.getNodeName(v.localizacao_atual)
+            origem_veiculo_nome = self._nome_localizacao(v, grafo)
 
-            # Rota veículo -> cliente usando o mesmo navegador
-            rota_ate_cliente = self.navegador.calcular_rota(
-                grafo=grafo,
-                origem=origem_veiculo_nome,
-                destino=origem_pedido_nome,
-            )
+            # Rota veículo -> cliente (e respetiva distância em km) usando o
+            # mesmo navegador; consultas repetidas vêm da cache do navegador
+            rota_ate_cliente, distancia_ate_cliente = self.navegador.calcular_rota_em_cache(
+                grafo, origem_veiculo_nome, origem_pedido_nome)
 
             if rota_ate_cliente is None:
                 continue
 
-            # Distância veículo -> cliente baseada nos quilómetros das arestas
-            distancia_ate_cliente = grafo.calcular_distancia_rota(
-                rota_ate_cliente)
-
-            if distancia_ate_cliente is None:
-                continue
-
             distancia_total = distancia_ate_cliente + distancia_pedido
 
             if v.autonomia_atual < distancia_total:
@@ -113,84 +98,92 @@ class AlocadorHeuristico(AlocadorBase):
     ) -> Optional[Veiculo]:
 
         origem_pedido_nome = grafo.getNodeName(pedido.origem)
-        candidatos = []
 
-        for v in veiculos_disponiveis:
+        # 1 — verificar capacidade e, para veículos em andamento, se passarão pela origem
+        elegiveis = self._filtrar_elegiveis(veiculos_disponiveis, pedido, grafo)
 
-            # 1 — verificar capacidade
-            if not self._verificar_capacidade(v, pedido):
-                continue
+        # 2 — rotas veículo -> cliente, calculadas numa única consulta
+        nomes_origem = [self._nome_localizacao(v, grafo) for v in elegiveis]
+        rotas = self.navegador.calcular_rotas_para_destino(
+            grafo, origem_pedido_nome, nomes_origem)
 
-            # Centralizar lógica: só considerar veículos em andamento que passarão pela origem
-            if not self._veiculo_passa_pela_origem(v, pedido, grafo):
-                continue
+        autonomia_ok = self._mascara_autonomia_rotas(
+            elegiveis, nomes_origem, rotas, distancia_pedido)
 
-            # 2 — converter nome/localização
-            origem_v = v.localizacao_atual if isinstance(
-                v.localizacao_atual, str) else grafo.getNodeName(
-                v.localizacao_atual)
+        # candidatos viáveis, guardados em colunas para o cálculo vetorial do score
+        viaveis, rotas_viaveis, distancias = [], [], []
+        custos_km, autonomias, penalizacoes = [], [], []
+
+        for i, (v, origem_v) in enumerate(zip(elegiveis, nomes_origem)):
 
             # 3 — rota veículo -> cliente
-            rota_ate_cliente = self.navegador.calcular_rota(
-                grafo=grafo,
-                origem=origem_v,
-                destino=origem_pedido_nome
-            )
+            rota_ate_cliente, distancia_ate_cliente = rotas[origem_v]
 
             if rota_ate_cliente is None:
                 continue
 
-            distancia_ate_cliente = grafo.calcular_distancia_rota(rota_ate_cliente)
-            if distancia_ate_cliente is None:
-                continue
-
             distancia_total = distancia_ate_cliente + distancia_pedido
 
             # 4 — verificar autonomia ou planear recarga se necessário
-            rota_completa = rota_ate_cliente + rota_pedido[1:]  # Concatenar rotas
-            if not self.verificar_ou_planear_recarga(v, distancia_total, rota_completa):
+            if not self.verificar_ou_planear_recarga(v, distancia_total, rota_ate_cliente,
+                                                     rota_pedido, autonomia_ok[i]):
                 continue
 
-            # 5 — calcular score
-            score = 0
-
-            # distância (quanto menor, melhor)
-            score += self.PESO_DISTANCIA * distancia_ate_cliente
-
-            # custo operacional (quanto maior, pior)
-            score += self.PESO_CUSTO * v.custo_operacional_km
-
-            # autonomia (quanto maior, melhor → subtrai)
-            score -= self.PESO_AUTONOMIA * v.autonomia_atual
-
-            # preferência ambiental
-            if pedido.preferencia_ambiental == "eco":
-                if v.tipo == "combustao":
-                    score += self.PENALIZACAO_COMBUSTAO
-
-            # Adicionar penalização se há plano de recarga
+            # Penalização se há plano de recarga
+            penalizacao_recarga = 0.0
             if v.plano_recarga_pendente:
                 if self.gestor_recargas and self.gestor_recargas.recarga_policy:
                     penalizacao_recarga = self.gestor_recargas.recarga_policy.calcular_penalizacao_recarga(
                         v.plano_recarga_pendente)
-                    score += penalizacao_recarga
 
-            candidatos.append((score, v, rota_ate_cliente, distancia_ate_cliente))
+            viaveis.append(v)
+            rotas_viaveis.append(rota_ate_cliente)
+            distancias.append(distancia_ate_cliente)
+            custos_km.append(v.custo_operacional_km)
+            autonomias.append(v.autonomia_atual)
+            penalizacoes.append(penalizacao_recarga)
 
         # nenhum candidato viável
-        if not candidatos:
+        if not viaveis:
             return None
 
-        # escolher o veículo com menor score
-        candidatos.sort(key=lambda x: x[0])
-        melhor_score, melhor_veiculo, rota, dist_cli = candidatos[0]
+        # 5 — calcular score de todos os candidatos de uma vez
+        combustao = None
+        if pedido.preferencia_ambiental == "eco":
+            combustao = np.fromiter((isinstance(v, VeiculoCombustao) for v in viaveis),
+                                    dtype=bool, count=len(viaveis))
+        score = self._calcular_scores(distancias, custos_km, autonomias, penalizacoes, combustao)
+
+        # escolher o veículo com menor score (em caso de empate, o primeiro)
+        i = int(np.argmin(score))
+        melhor_veiculo = viaveis[i]
 
         # guardar dados no veículo
-        melhor_veiculo.rota_ate_cliente = rota
-        melhor_veiculo.distancia_ate_cliente = dist_cli
+        melhor_veiculo.rota_ate_cliente = rotas_viaveis[i]
+        melhor_veiculo.distancia_ate_cliente = distancias[i]
 
         return melhor_veiculo
 
+    def _calcular_scores(self, distancias: List[float], custos_km: List[float],
+                         autonomias: List[float], penalizacoes: List[float],
+                         combustao: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score de cada candidato (menor é melhor), numa única passagem vetorial.
+
+        As operações são feitas in-place sobre o mesmo array para evitar temporários.
+        """
+        # distância (quanto menor, melhor)
+        score = np.multiply(self.PESO_DISTANCIA, distancias, dtype=float)
+        # custo operacional (quanto maior, pior)
+        score += np.multiply(self.PESO_CUSTO, custos_km, dtype=float)
+        # autonomia (quanto maior, melhor → subtrai)
+        score -= np.multiply(self.PESO_AUTONOMIA, autonomias, dtype=float)
+        # preferência ambiental
+        if combustao is not None:
+            score += self.PENALIZACAO_COMBUSTAO * combustao
+        # penalização de recarga
+        score += penalizacoes
+        return score
+
     def nome_algoritmo(self):
         return "Heurístico"
 
@@ -215,31 +208,25 @@ class AlocadorPorCusto(AlocadorBase):
         melhor = None
         melhor_custo = float('inf')
 
-        for v in veiculos_disponiveis:
-            if not self._verificar_capacidade(v, pedido):
-                continue
+        elegiveis = self._filtrar_elegiveis(veiculos_disponiveis, pedido, grafo)
+        nomes_origem = [self._nome_localizacao(v, grafo) for v in elegiveis]
+        rotas = self.navegador.calcular_rotas_para_destino(
+            grafo, origem_pedido_nome, nomes_origem)
 
-            if not self._veiculo_passa_pela_origem(v, pedido, grafo):
-                continue
+        autonomia_ok = self._mascara_autonomia_rotas(
+            elegiveis, nomes_origem, rotas, distancia_pedido)
 
-            origem_veiculo_nome = v.localizacao_atual if isinstance(
-                v.localizacao_atual, str) else grafo.getNodeName(
-                v.localizacao_atual)
-
-            rota_ate_cliente = self.navegador.calcular_rota(
-                grafo=grafo, origem=origem_veiculo_nome, destino=origem_pedido_nome)
+        for i, (v, origem_veiculo_nome) in enumerate(zip(elegiveis, nomes_origem)):
+            rota_ate_cliente, distancia_ate_cliente = rotas[origem_veiculo_nome]
             if rota_ate_cliente is None:
                 continue
             #nota: o navegador a calcular rota devia ter em conta a politica de ryde-sharing se aplicavel
-            distancia_ate_cliente = grafo.calcular_distancia_rota(rota_ate_cliente)
-            if distancia_ate_cliente is None:
-                continue
 
             distancia_total = distancia_ate_cliente + distancia_pedido
 
             # Verificar autonomia ou planear recarga se necessário
-            rota_completa = rota_ate_cliente + rota_pedido[1:]
-            if not self.verificar_ou_planear_recarga(v, distancia_total, rota_completa):
+            if not self.verificar_ou_planear_recarga(v, distancia_total, rota_ate_cliente,
+                                                     rota_pedido, autonomia_ok[i]):
                 continue
 
             # custo estimado = (distancia_total) * custo_operacional_km
@@ -276,34 +263,43 @@ class AlocadorAEstrela(AlocadorBase):
             rota_pedido: List[str],
             distancia_pedido: float) -> Optional[Veiculo]:
         origem_pedido_nome = grafo.getNodeName(pedido.origem)
-        candidatos = []
+        melhor = (float('inf'), None, None, None)
 
-        for v in veiculos_disponiveis:
-            if not self._verificar_capacidade(v, pedido):
-                continue
+        elegiveis = self._filtrar_elegiveis(veiculos_disponiveis, pedido, grafo)
+        nomes_origem = [self._nome_localizacao(v, grafo) for v in elegiveis]
+        rotas = self.navegador.calcular_rotas_para_destino(
+            grafo, origem_pedido_nome, nomes_origem)
 
-            if not self._veiculo_passa_pela_origem(v, pedido, grafo):
-                continue
+        # A rota do pedido é a mesma para todos os veículos: se o custo não depende
+        # do veículo, calcula-se uma única vez
+        custo_pedido_comum = None
+        if not self.funcao_custo.depende_do_veiculo:
+            custo_pedido_comum = self.funcao_custo.custo_rota_com_distancia(
+                grafo, rota_pedido, distancia_pedido)
 
-            origem_veiculo_nome = v.localizacao_atual if isinstance(
-                v.localizacao_atual, str) else grafo.getNodeName(
-                v.localizacao_atual)
+        autonomia_ok = self._mascara_autonomia_rotas(
+            elegiveis, nomes_origem, rotas, distancia_pedido)
 
-            rota_ate_cliente = self.navegador.calcular_rota(
-                grafo=grafo, origem=origem_veiculo_nome, destino=origem_pedido_nome)
+        for i, (v, origem_veiculo_nome) in enumerate(zip(elegiveis, nomes_origem)):
+            rota_ate_cliente, distancia_ate_cliente = rotas[origem_veiculo_nome]
             if rota_ate_cliente is None:
                 continue
 
             # g: custo real da rota (veiculo->cliente + pedido)
-            custo_ate_cliente = self.funcao_custo.custo_rota(grafo, rota_ate_cliente, v)
-            custo_pedido = self.funcao_custo.custo_rota(grafo, rota_pedido, v)
+            custo_ate_cliente = self.funcao_custo.custo_rota_com_distancia(
+                grafo, rota_ate_cliente, distancia_ate_cliente, v)
+            if custo_pedido_comum is not None:
+                custo_pedido = custo_pedido_comum
+            else:
+                custo_pedido = self.funcao_custo.custo_rota_com_distancia(
+                    grafo, rota_pedido, distancia_pedido, v)
             g = custo_ate_cliente + custo_pedido
 
-            distancia_total = grafo.calcular_distancia_rota(rota_ate_cliente) + distancia_pedido
+            distancia_total = distancia_ate_cliente + distancia_pedido
 
             # Verificar autonomia ou planear recarga se necessário
-            rota_completa = rota_ate_cliente + rota_pedido[1:]
-            if not self.verificar_ou_planear_recarga(v, distancia_total, rota_completa):
+            if not self.verificar_ou_planear_recarga(v, distancia_total, rota_ate_cliente,
+                                                     rota_pedido, autonomia_ok[i]):
                 continue
 
             # h: heurística entre veículo e origem do pedido
@@ -318,14 +314,15 @@ class AlocadorAEstrela(AlocadorBase):
                         v.plano_recarga_pendente)
                     score += penalizacao_recarga
 
-            candidatos.append(
-                (score, v, rota_ate_cliente, grafo.calcular_distancia_rota(rota_ate_cliente)))
+            # Em empate fica o primeiro; com todos os scores infinitos (ex.: acidente
+            # na rota do pedido) ainda se escolhe um veículo, como a ordenação fazia
+            if melhor[1] is None or score < melhor[0]:
+                melhor = (score, v, rota_ate_cliente, distancia_ate_cliente)
 
-        if not candidatos:
+        if melhor[1] is None:
             return None
 
-        candidatos.sort(key=lambda x: x[0])
-        _, melhor_veiculo, rota, dist_cli = candidatos[0]
+        _, melhor_veiculo, rota, dist_cli = melhor
         melhor_veiculo.rota_ate_cliente = rota
         melhor_veiculo.distancia_ate_cliente = dist_cli
         return melhor_veiculo
@@ -1,8 +1,14 @@
 import heapq
-from typing import Optional, List, Dict
+import itertools
 from collections import deque
+from typing import Optional, List, Dict
 from algoritmos.navegador_base import NavegadorBase
+from algoritmos.criterios import FuncaoCusto, Heuristica
 from infra.grafo.grafo import Grafo
+from infra.grafo.grafo_csr import (
+    MemoriaBFS, bfs_bidirecional_csr, bfs_csr_inversa, custo_minimo_csr
+)
+from infra.grafo.grafo_ch import construir_ch
 
 
 # Implementação dos algoritmos de navegação
@@ -17,22 +23,42 @@ class NavegadorDFS(NavegadorBase):
     DFS explora em profundidade antes de explorar outros ramos.
     """
 
-    def dfsAux(self, grafo: Grafo, origem: str, destino: str, visitados: list[str]):
+    # Devolve o primeiro caminho encontrado, não o mais curto
+    ROTAS_MINIMAS = False
+
+    def dfsAux(self, grafo: Grafo, origem: str, destino: str, visitados: set[str]):
         if origem == destino:
             return [origem]
 
-        visitados.append(origem)
+        # DFS iterativa: cada entrada da pilha guarda o nó e o iterador dos seus
+        # vizinhos, o que reproduz a ordem da versão recursiva sem limite de recursão.
+        get_vizinhos = grafo.getNeighbours
+        visitados.add(origem)
+        pais = {origem: None}
+        pilha = [(origem, iter(get_vizinhos(origem)))]
+
+        while pilha:
+            no_atual, vizinhos = pilha[-1]
+            proximo = next(vizinhos, None)
+
+            if proximo is None:
+                pilha.pop()
+                continue
+
+            vizinho = proximo[0]
+            if vizinho in visitados:
+                continue
 
-        for (vizinho, _) in grafo.getNeighbours(origem):
-            if vizinho not in visitados:
-                resultado = self.dfsAux(grafo, vizinho, destino, visitados)
-                if resultado:
-                    return [origem] + resultado
+            visitados.add(vizinho)
+            pais[vizinho] = no_atual
+            if vizinho == destino:
+                return self._reconstruir_caminho(pais, destino)
+            pilha.append((vizinho, iter(get_vizinhos(vizinho))))
 
         return None
 
     def dfs(self, grafo: Grafo, origem: str, destino: str):
-        return self.dfsAux(grafo, origem, destino, [])
+        return self.dfsAux(grafo, origem, destino, set())
 
     def calcular_rota(self, grafo: Grafo, origem: str, destino: str):
         return self.dfs(grafo, origem, destino)
@@ -52,30 +78,54 @@ class NavegadorBFS(NavegadorBase):
     BFS garante o caminho com menor número de arestas (não necessariamente o mais curto em distância).
     """
 
+    def __init__(
+            self,
+            funcao_custo: Optional[FuncaoCusto] = None,
+            heuristica: Optional[Heuristica] = None):
+        super().__init__(funcao_custo, heuristica)
+        # Vetores de trabalho reutilizados entre consultas (não é thread-safe)
+        self._memoria = MemoriaBFS()
+
     def bfs(self, grafo: Grafo, origem: str, destino: str):
         if origem == destino:
             return [origem]
 
-        fila = deque([[origem]])
-        visitados = set([origem])
+        # Procura bidirecional sobre índices inteiros (CSR): a partir da origem
+        # (arestas diretas) e do destino (arestas invertidas), expandindo sempre a
+        # fronteira mais pequena; continua a devolver o caminho com menos arestas.
+        csr = grafo.get_csr()
+        i_origem = csr.indice(origem)
+        i_destino = csr.indice(destino)
+        if i_origem is None or i_destino is None:
+            return None
 
-        while fila:
-            caminho = fila.popleft()
-            no_atual = caminho[-1]
+        caminho = bfs_bidirecional_csr(csr, i_origem, i_destino, self._memoria)
+        if caminho is None:
+            return None
 
-            for vizinho, _ in grafo.getNeighbours(no_atual):
-                if vizinho not in visitados:
-                    novo_caminho = caminho + [vizinho]
-                    if vizinho == destino:
-                        return novo_caminho
-                    fila.append(novo_caminho)
-                    visitados.add(vizinho)
-
-        return None
+        return [csr.idx_to_name[i] for i in caminho]
 
     def calcular_rota(self, grafo: Grafo, origem: str, destino: str):
         return self.bfs(grafo, origem, destino)
 
+    def _rotas_para_destino(self, grafo: Grafo, destino: str,
+                            origens: List[str]) -> Dict[str, Optional[List[str]]]:
+        """Uma única BFS invertida a partir do destino cobre todas as origens."""
+        csr = grafo.get_csr()
+        i_destino = csr.indice(destino)
+        if i_destino is None:
+            return {}
+
+        indices_origens = {o: csr.indice(o) for o in origens}
+        pais = bfs_csr_inversa(
+            csr, i_destino, {i for i in indices_origens.values() if i is not None})
+
+        rotas = {}
+        for origem, i in indices_origens.items():
+            if i is not None and pais[i] != -1:
+                rotas[origem] = csr.caminho_ate_raiz(pais, i)
+        return rotas
+
     def nome_algoritmo(self) -> str:
         return "BFS (Breadth-First Search)"
 
@@ -88,6 +138,9 @@ class NavegadorCustoUniforme(NavegadorBase):
     """
     Implementação do algoritmo Uniform Cost Search (UCS).
     Usa apenas custos reais das arestas (sem heurística).
+
+    A procura corre sobre os índices inteiros do CSR do grafo, com os custos das
+    arestas numa lista plana (ver `custo_minimo_csr`).
     """
 
     def calcular_rota(self, grafo: Grafo, origem: str, destino: str,
@@ -95,48 +148,78 @@ class NavegadorCustoUniforme(NavegadorBase):
         if origem == destino:
             return [origem]
 
-        # Fila de prioridade com tuplos (custo acumulado, nó atual, caminho)
-        fronteira = [(0.0, origem, [origem])]
-        melhor_custo = {origem: 0.0}
+        csr = grafo.get_csr()
+        i_origem = csr.indice(origem)
+        i_destino = csr.indice(destino)
+        if i_origem is None or i_destino is None:
+            return None
 
-        while fronteira:
-            custo_atual, no_atual, caminho = heapq.heappop(fronteira)
+        pesos = self._pesos_arestas_csr(grafo, veiculo)
+        caminho = custo_minimo_csr(csr, pesos, i_origem, i_destino)
+        if caminho is None:
+            return None  # Sem caminho possível
 
-            # Se chegámos ao destino, devolvemos o caminho
-            if no_atual == destino:
-                return caminho
+        return [csr.idx_to_name[i] for i in caminho]
 
-            # Garantia de optimalidade: se já vimos este nó com custo menor, ignoramos
-            if custo_atual > melhor_custo.get(no_atual, float("inf")):
-                continue
+    def nome_algoritmo(self) -> str:
+        return "Custo Uniforme"
 
-            # Percorrer todas as arestas que saem do nó atual
-            # getNeighbours retorna lista de tuplos (nome_vizinho, aresta)
-            vizinhos = grafo.getNeighbours(no_atual)
-            if vizinhos is None:
-                continue
+#############
+#   *ch*
+#############
+
+
+class NavegadorCH(NavegadorBase):
+    """
+    Caminho de custo mínimo com Contraction Hierarchies.
+
+    Dá as mesmas rotas ótimas que o Custo Uniforme (para a `funcao_custo`), mas
+    pré-processa o grafo uma vez e responde depois a cada consulta com uma
+    procura bidirecional muito mais pequena. A hierarquia só é reconstruída
+    quando mudam os custos das arestas para a `funcao_custo` (ou a estrutura
+    do grafo): um evento de trânsito não a invalida se o custo o ignorar.
+    """
 
-            for (no_destino, aresta) in vizinhos:
-                if veiculo is None:
-                    custo_aresta = self.funcao_custo.custo_aresta(aresta)
-                else:
-                    custo_aresta = self.funcao_custo.custo_aresta(
-                        aresta, veiculo)
+    def __init__(
+            self,
+            funcao_custo: Optional[FuncaoCusto] = None,
+            heuristica: Optional[Heuristica] = None):
+        super().__init__(funcao_custo, heuristica)
+        self._ch = None
+        # (csr, funcao_custo, pesos) com que a hierarquia foi construída; guarda-se
+        # o próprio CSR (e não o seu id) para nunca a reutilizar noutro grafo
+        self._ch_estado = None
+
+    def _obter_ch(self, grafo: Grafo):
+        csr = grafo.get_csr()
+        # Os pesos são recalculados a cada versão do grafo, mas só se reconstrói
+        # a hierarquia se algum tiver mudado (ex.: CustoDefault ignora o trânsito)
+        pesos = csr.pesos(self.funcao_custo, grafo.versao)
+        estado = self._ch_estado
+        if (self._ch is None or estado[0] is not csr or estado[1] is not self.funcao_custo
+                or (estado[2] is not pesos and estado[2] != pesos)):
+            self._ch = construir_ch(csr, self.funcao_custo.custo_aresta)
+        self._ch_estado = (csr, self.funcao_custo, pesos)
+        return self._ch
+
+    def calcular_rota(self, grafo: Grafo, origem: str, destino: str) -> Optional[List[str]]:
+        if origem == destino:
+            return [origem]
 
-                novo_custo = custo_atual + custo_aresta
+        csr = grafo.get_csr()
+        i_origem = csr.indice(origem)
+        i_destino = csr.indice(destino)
+        if i_origem is None or i_destino is None:
+            return None
 
-                # Só expandimos caminhos melhores
-                if novo_custo < melhor_custo.get(no_destino, float("inf")):
-                    melhor_custo[no_destino] = novo_custo
-                    heapq.heappush(
-                        fronteira,
-                        (novo_custo, no_destino, caminho + [no_destino])
-                    )
+        caminho = self._obter_ch(grafo).caminho(i_origem, i_destino)
+        if caminho is None:
+            return None
 
-        return None  # Sem caminho possível
+        return [csr.idx_to_name[i] for i in caminho]
 
     def nome_algoritmo(self) -> str:
-        return "Custo Uniforme"
+        return "Contraction Hierarchies"
 
 #############
 #   *greedy*
@@ -147,6 +230,9 @@ class NavegadorGreedy(NavegadorBase):
     Implementação do algoritmo Greedy Search.
     Baseado apenas na heurística (h).
     """
+
+    ROTAS_MINIMAS = False
+
     def nome_algoritmo(self) -> str:
         return "Greedy"
     
@@ -156,37 +242,47 @@ class NavegadorGreedy(NavegadorBase):
             return [origem]
 
         fronteira = []
-        
+
+        # h só ordena a fronteira (não é somada ao custo): basta a ordem da estimativa
+        h = self._heuristica_memorizada(grafo, destino, so_ordem=True)
+
         # h(origem)
-        heuristica_inicial = self.heuristica.estimativa(grafo, origem, destino)
+        heuristica_inicial = h(origem)
         
-        heapq.heappush(fronteira, (heuristica_inicial, origem, [origem], 0.0))
+        # Cada entrada guarda o nó de onde veio; o predecessor só fica fixo
+        # quando o nó é expandido
+        contador = itertools.count()
+        heapq.heappush(fronteira, (heuristica_inicial, next(contador), origem, None, 0.0))
 
         visitados = set()
-        
+        veio_de = {}
+
+        get_vizinhos = grafo.getNeighbours
+        custo_aresta = self.funcao_custo.custo_aresta
+
         while fronteira:
-            heuristica_atual, no_atual, caminho, custoAcumulado_atual = heapq.heappop(fronteira)
+            heuristica_atual, _, no_atual, pai, custoAcumulado_atual = heapq.heappop(fronteira)
 
             if no_atual in visitados:
                 continue
 
             visitados.add(no_atual)
+            veio_de[no_atual] = pai
 
             if no_atual == destino:
-                return caminho
+                return self._reconstruir_caminho(veio_de, destino)
 
-            for (no_vizinho, aresta) in grafo.getNeighbours(no_atual):
+            for (no_vizinho, aresta) in get_vizinhos(no_atual):
                 if no_vizinho in visitados:
                     continue
 
-                custo_aresta = self.funcao_custo.custo_aresta(aresta, veiculo)
-                custoAcumulado_novo = custoAcumulado_atual + custo_aresta
+                custoAcumulado_novo = custoAcumulado_atual + custo_aresta(aresta, veiculo)
 
-                heuristica_nova = self.heuristica.estimativa(grafo, no_vizinho, destino)
+                heuristica_nova = h(no_vizinho)
                 
                 heapq.heappush(
                     fronteira,
-                    (heuristica_nova, no_vizinho, caminho + [no_vizinho], custoAcumulado_novo)
+                    (heuristica_nova, next(contador), no_vizinho, no_atual, custoAcumulado_novo)
                 )
         
         return None  # Sem caminho
@@ -201,6 +297,10 @@ class NavegadorAEstrela(NavegadorBase):
     Implementação do algoritmo A* Informed Search.
     Combina custo acumulado (g) com uma heurística (h)
     para minimizar f = g + h.
+
+    Tal como o Custo Uniforme, corre sobre os índices inteiros do CSR; h(n) é
+    calculada uma só vez por nó em cada consulta (para todos os nós de uma vez,
+    se a heurística suportar `estimativas_por_no`).
     """
 
     def nome_algoritmo(self) -> str:
@@ -211,136 +311,115 @@ class NavegadorAEstrela(NavegadorBase):
         if origem == destino:
             return [origem]
 
-        # Priority queue storing (f(n), g(n), node, path)
-        fronteira = []
-
-        # custo acumulado g(origem) = 0
-        custoAcumulado_inicial = 0.0
-
-        # f(origem) = g + h
-        custoEstimado_inicial = custoAcumulado_inicial + \
-            self.heuristica.estimativa(grafo, origem, destino)
-
-        heapq.heappush(fronteira, (custoEstimado_inicial,
-                       custoAcumulado_inicial, origem, [origem]))
-
-        # Guarda o menor custo já encontrado para cada nó (g(n))
-        melhor_g = {origem: 0.0}
-
-        while fronteira:
-            custoEstimado_atual, custoAcumulado_atual, no_atual, caminho = heapq.heappop(
-                fronteira)
-
-            # Se chegámos ao destino → devolvemos o caminho ótimo
-            if no_atual == destino:
-                return caminho
-
-            # Expandir vizinhos
-            # getNeighbours retorna lista de tuplos (nome_vizinho, aresta)
-            for (no_vizinho, aresta) in grafo.getNeighbours(no_atual):
-                # custo da aresta (pode depender do veículo)
-                custo_aresta = self.funcao_custo.custo_aresta(aresta, veiculo)
-                custoAcumulado_novo = custoAcumulado_atual + custo_aresta
-
-                # Se este caminho for pior do que outro já encontrado, ignora
-                if custoAcumulado_novo >= melhor_g.get(no_vizinho, float("inf")):
-                    continue
+        csr = grafo.get_csr()
+        i_origem = csr.indice(origem)
+        i_destino = csr.indice(destino)
+        if i_origem is None or i_destino is None:
+            return None
 
-                melhor_g[no_vizinho] = custoAcumulado_novo
+        nomes = csr.idx_to_name
 
-                # calcular h(n)
-                heuristica_nova = self.heuristica.estimativa(
-                    grafo, no_vizinho, destino)
+        # h(n) de todos os nós numa só operação vetorial, quando a heurística o
+        # suporta; senão, memorizada durante esta consulta
+        estimativas = self.heuristica.estimativas_por_no(grafo, destino)
+        if estimativas is not None:
+            h = estimativas.tolist().__getitem__
+        else:
+            h_nome = self._heuristica_memorizada(grafo, destino)
 
-                # f(n) = g(n) + h(n)
-                custoEstimado_novo = custoAcumulado_novo + heuristica_nova
+            def h(i: int) -> float:
+                return h_nome(nomes[i])
 
-                heapq.heappush(
-                    fronteira,
-                    (custoEstimado_novo, custoAcumulado_novo,
-                     no_vizinho, caminho + [no_vizinho])
-                )
+        pesos = self._pesos_arestas_csr(grafo, veiculo)
+        caminho = custo_minimo_csr(csr, pesos, i_origem, i_destino, h)
+        if caminho is None:
+            return None  # Sem caminho
 
-        return None  # Sem caminho
+        return [nomes[i] for i in caminho]
 
 
 class NavegadorBidirecional(NavegadorBase):
     """
     Procura bidirecional: expande simultaneamente a partir da origem e do destino.
 
-    Funciona melhor em grafos não dirigidos; em grafos dirigidos a expansão "para trás"
-    utiliza uma verificação por predecessores (mais custosa).
-    """
+    Cada passo expande uma camada BFS completa do lado com a fronteira mais
+    pequena, pelo que a rota devolvida tem o número mínimo de arestas.
 
-    def nome_algoritmo(self) -> str:
-        return "Bidirecional"
+    Só serve para custos unitários: a `funcao_custo` é ignorada e, com pesos, o
+    primeiro encontro não garante a rota mais barata (para isso seria preciso
+    continuar até o topo das duas filas de prioridade somar pelo menos o custo
+    do melhor encontro). Para custo mínimo usar Custo Uniforme, A* ou CH.
 
-    def _predecessors(self, grafo: Grafo, nodo: str):
-        """Retorna lista de tuplos (nome_nodo, aresta) que apontam para `nodo`.
+    Em grafos dirigidos a expansão "para trás" segue os predecessores de cada nó,
+    a partir do mapa mantido pelo próprio grafo (`Grafo.get_predecessores`).
+    """
 
-        Nota: Grafo não fornece API direta para predecessores; percorremos as
-        adjacências. Em grafos não dirigidos isso é equivalente a neighbours.
-        """
-        preds = []
-        try:
-            for n, adj in grafo.m_graph.items():
-                for (dest, aresta) in adj:
-                    if dest == nodo:
-                        preds.append((n, aresta))
-        except Exception:
-            return []
-        return preds
+    def nome_algoritmo(self) -> str:
+        return "Bidirecional (BFS)"
 
     def calcular_rota(self, grafo: Grafo, origem: str, destino: str):
         if origem == destino:
             return [origem]
 
-        # fronteiras: mapa nodo -> caminho (lista de nomes) desde a origem/destino
-        fronteira_frente = {origem: [origem]}
-        fronteira_tras = {destino: [destino]}
-
-        visitados_frente = {origem: [origem]}
-        visitados_tras = {destino: [destino]}
+        # filas BFS e mapas nodo -> pai (a origem/destino não têm pai)
+        fila_frente = deque([origem])
+        fila_tras = deque([destino])
+        pais_frente = {origem: None}
+        pais_tras = {destino: None}
+        dist_frente = {origem: 0}
+        dist_tras = {destino: 0}
+
+        mapa_preds = grafo.get_predecessores()
+
+        while fila_frente and fila_tras:
+            # Expandir uma camada completa do lado com a fronteira mais pequena
+            if len(fila_frente) <= len(fila_tras):
+                encontro = self._expandir_camada(
+                    fila_frente, grafo.m_graph, pais_frente, dist_frente, dist_tras)
+            else:
+                # para trás seguem-se os predecessores (grafos dirigidos)
+                encontro = self._expandir_camada(
+                    fila_tras, mapa_preds, pais_tras, dist_tras, dist_frente)
+
+            if encontro is not None:
+                caminho = self._reconstruir_caminho(pais_frente, encontro)
+                nodo = pais_tras[encontro]
+                while nodo is not None:
+                    caminho.append(nodo)
+                    nodo = pais_tras[nodo]
+                return caminho
 
-        while fronteira_frente and fronteira_tras:
-            # Expandir a fronteira com menos nós (heurística simples)
-            if len(fronteira_frente) <= len(fronteira_tras):
-                # expandir frente
-                nodo_atual, caminho = fronteira_frente.popitem()
+        return None
 
-                for (vizinho, _) in grafo.getNeighbours(nodo_atual):
-                    if vizinho in visitados_frente:
-                        continue
+    @staticmethod
+    def _expandir_camada(fila: deque, adjacencias: Dict[str, List[tuple]], pais: Dict,
+                         dist: Dict[str, int], dist_outro: Dict[str, int]) -> Optional[str]:
+        """Expande exatamente os nós da camada atual de `fila`.
 
-                    novo_caminho = caminho + [vizinho]
-                    visitados_frente[vizinho] = novo_caminho
-                    fronteira_frente[vizinho] = novo_caminho
+        Como a camada é processada até ao fim, devolve-se o encontro com menos
+        arestas no total (e não apenas o primeiro), o que garante rotas mínimas.
 
-                    if vizinho in visitados_tras:
-                        # encontro — combinar caminhos
-                        caminho_destino = visitados_tras[vizinho]
-                        caminho_dest_rev = caminho_destino[::-1]
-                        return novo_caminho + caminho_dest_rev[1:]
-            else:
-                # expandir trás (usar predecessores para grafos dirigidos)
-                nodo_atual, caminho = fronteira_tras.popitem()
-
-                preds = self._predecessors(grafo, nodo_atual)
-                # se grafo não for dirigido, preds equivale a getNeighbours
-                if not preds:
-                    preds = [(n, a) for (n, a) in grafo.getNeighbours(nodo_atual)]
+        Returns:
+            Nó de encontro com a outra procura, ou None se ainda não se cruzaram
+        """
+        encontro = None
+        melhor = float('inf')
 
-                for (vizinho, _) in preds:
-                    if vizinho in visitados_tras:
-                        continue
+        for _ in range(len(fila)):
+            nodo_atual = fila.popleft()
+            d = dist[nodo_atual] + 1
 
-                    novo_caminho = caminho + [vizinho]
-                    visitados_tras[vizinho] = novo_caminho
-                    fronteira_tras[vizinho] = novo_caminho
+            # só interessa o nome do vizinho: indexar evita desempacotar a aresta
+            for adj in adjacencias.get(nodo_atual, ()):
+                vizinho = adj[0]
+                if vizinho in pais:
+                    continue
+                pais[vizinho] = nodo_atual
+                dist[vizinho] = d
+                fila.append(vizinho)
 
-                    if vizinho in visitados_frente:
-                        caminho_frente = visitados_frente[vizinho]
-                        caminho_tras_rev = novo_caminho[::-1]
-                        return caminho_frente + caminho_tras_rev[1:]
+                if vizinho in dist_outro and d + dist_outro[vizinho] < melhor:
+                    melhor = d + dist_outro[vizinho]
+                    encontro = vizinho
 
-        return None
+        return encontro
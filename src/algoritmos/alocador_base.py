@@ -5,12 +5,15 @@ Todos os algoritmos de escolha de veículo devem herdar desta classe.
 from abc import ABC, abstractmethod
 from typing import Optional, List
 
+import numpy as np
+
 from infra.entidades.veiculos import Veiculo
 from infra.entidades.pedidos import Pedido
 from infra.grafo.grafo import Grafo
-from algoritmos.criterios import FuncaoCusto, Heuristica, CustoDefault, ZeroHeuristica
+from algoritmos.criterios import FuncaoCusto, Heuristica
 from infra.entidades.veiculos import EstadoVeiculo
 from infra.entidades.recarga import PlanoRecarga
+from algoritmos.navegador_base import CUSTO_DEFAULT, HEURISTICA_ZERO
 
 
 class AlocadorBase(ABC):
@@ -38,9 +41,16 @@ class AlocadorBase(ABC):
             heuristica: Heurística para estimativas
             gestor_recargas: Gestor de recargas (opcional, para planeamento de recarga)
         """
+        # Navegadores que devolvem um caminho qualquer (ex.: DFS) levariam a
+        # decisões de autonomia e custo erradas: quem cria o alocador escolhe
+        # outro navegador (ver `Config.get_alocador`)
+        if not navegador.ROTAS_MINIMAS:
+            raise ValueError(
+                f"O navegador {navegador.nome_algoritmo()} não devolve rotas mínimas "
+                "e não pode ser usado na alocação de veículos")
         self.navegador = navegador
-        self.funcao_custo: FuncaoCusto = funcao_custo if funcao_custo is not None else CustoDefault()
-        self.heuristica: Heuristica = heuristica if heuristica is not None else ZeroHeuristica()
+        self.funcao_custo: FuncaoCusto = funcao_custo if funcao_custo is not None else CUSTO_DEFAULT
+        self.heuristica: Heuristica = heuristica if heuristica is not None else HEURISTICA_ZERO
         self.gestor_recargas = None  # a ser configurado externamente
 
         # adicionar estrutura auxiliar talvez dicionario de idveiulo para infos
@@ -81,6 +91,48 @@ class AlocadorBase(ABC):
         """Verifica se o veículo tem capacidade para o número de passageiros."""
         return veiculo.capacidade_passageiros >= veiculo.numero_passageiros + pedido.numero_passageiros
 
+    @staticmethod
+    def _mascara_capacidade(veiculos: List[Veiculo], pedido: Pedido) -> np.ndarray:
+        """Versão vetorial de `_verificar_capacidade` para uma lista de veículos.
+
+        Returns:
+            Array booleano com True nos veículos com lugares livres suficientes
+        """
+        lugares_livres = np.fromiter(
+            (v.capacidade_passageiros - v.numero_passageiros for v in veiculos),
+            dtype=np.int64, count=len(veiculos))
+        return lugares_livres >= pedido.numero_passageiros
+
+    @staticmethod
+    def _mascara_autonomia(veiculos: List[Veiculo], distancias: List[float],
+                           margem_seguranca: float = 5.0) -> np.ndarray:
+        """Versão vetorial de `Veiculo.autonomia_suficiente_para` (mesma margem).
+
+        Args:
+            veiculos: Veículos candidatos
+            distancias: Distância total que cada veículo precisa percorrer
+
+        Returns:
+            Array booleano com True nos veículos com autonomia suficiente
+        """
+        autonomias = np.fromiter((v.autonomia_atual for v in veiculos),
+                                 dtype=float, count=len(veiculos))
+        return autonomias >= np.add(distancias, margem_seguranca, dtype=float)
+
+    def _mascara_autonomia_rotas(self, veiculos: List[Veiculo], nomes_origem: List[str],
+                                 rotas: dict, distancia_pedido: float) -> np.ndarray:
+        """`_mascara_autonomia` para a distância até ao cliente (de `rotas`) mais a do pedido.
+
+        Veículos sem rota até ao cliente ficam a False.
+        """
+        inf = float('inf')
+        distancias = []
+        for origem in nomes_origem:
+            distancia_ate_cliente = rotas[origem][1]
+            distancias.append(inf if distancia_ate_cliente is None
+                              else distancia_ate_cliente + distancia_pedido)
+        return self._mascara_autonomia(veiculos, distancias)
+
     def _verificar_autonomia(self, veiculo: Veiculo, distancia: float) -> bool:
         """Verifica se o veículo tem autonomia suficiente para a distância.
 
@@ -102,8 +154,29 @@ class AlocadorBase(ABC):
         origem_pedido_nome = grafo.getNodeName(pedido.origem)
         return veiculo.passa_por(origem_pedido_nome)
 
+    def _filtrar_elegiveis(self, veiculos: List[Veiculo], pedido: Pedido,
+                           grafo: Grafo) -> List[Veiculo]:
+        """Veículos com capacidade para o pedido e (se em andamento) que passam pela origem.
+
+        O nome da origem do pedido é resolvido uma única vez para todos os veículos.
+        """
+        origem_pedido_nome = grafo.getNodeName(pedido.origem)
+        em_andamento = EstadoVeiculo.EM_ANDAMENTO
+        return [veiculos[i] for i in np.flatnonzero(self._mascara_capacidade(veiculos, pedido))
+                if veiculos[i].estado != em_andamento or veiculos[i].passa_por(origem_pedido_nome)]
+
+    @staticmethod
+    def _nome_localizacao(veiculo: Veiculo, grafo: Grafo) -> str:
+        """Nome do nó onde o veículo está (a localização pode ser nome ou ID)."""
+        nome = veiculo.localizacao_atual_nome
+        if nome is not None:
+            return nome
+        return grafo.getNodeName(veiculo.localizacao_atual)
+
     def verificar_ou_planear_recarga(self, veiculo: Veiculo, distancia_total: float,
-                                     rota_completa: Optional[List[str]] = None) -> bool:
+                                     rota_ate_cliente: Optional[List[str]] = None,
+                                     rota_pedido: Optional[List[str]] = None,
+                                     autonomia_suficiente: Optional[bool] = None) -> bool:
         """
         Verifica autonomia e planeia recarga se necessário.
 
@@ -113,14 +186,21 @@ class AlocadorBase(ABC):
         Args:
             veiculo: Veículo a verificar
             distancia_total: Distância total a percorrer
-            rota_completa: Rota completa planeada (util para políticas que considerem desvio)
+            rota_ate_cliente: Rota veículo -> cliente
+            rota_pedido: Rota do pedido; juntas formam a rota completa planeada
+                (util para políticas que considerem desvio), que só é construída
+                quando é preciso planear recarga
+            autonomia_suficiente: Resultado já calculado (ex.: por
+                `_mascara_autonomia`) da verificação de autonomia, se existir
 
         Returns:
             True se veículo é elegível (tem autonomia ou plano de recarga viável),
             False caso contrário
         """
         # Verificar autonomia direta
-        if veiculo.autonomia_suficiente_para(distancia_total):
+        if autonomia_suficiente is None:
+            autonomia_suficiente = veiculo.autonomia_suficiente_para(distancia_total)
+        if autonomia_suficiente:
             veiculo.plano_recarga_pendente = None  # Limpar plano antigo se houver
             return True
 
@@ -130,6 +210,7 @@ class AlocadorBase(ABC):
             return False
 
         # Planear recarga
+        rota_completa = self._juntar_rotas(rota_ate_cliente, rota_pedido)
         plano = self.gestor_recargas.planear_recarga(veiculo, rota_completa)
 
         if plano and plano.viavel:
@@ -140,3 +221,13 @@ class AlocadorBase(ABC):
             # Sem plano viável, veículo inelegível
             veiculo.plano_recarga_pendente = None
             return False
+
+    @staticmethod
+    def _juntar_rotas(rota_ate_cliente: Optional[List[str]],
+                      rota_pedido: Optional[List[str]]) -> Optional[List[str]]:
+        """Concatena as rotas sem repetir o nó de junção (a origem do pedido)."""
+        if not rota_pedido:
+            return rota_ate_cliente
+        if not rota_ate_cliente:
+            return rota_pedido
+        return rota_ate_cliente + rota_pedido[1:]
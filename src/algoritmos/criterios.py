@@ -6,6 +6,6 @@ from .funcoes_custo import FuncaoCusto, CustoDefault, CustoTempoPercurso, CustoA
 from .heuristicas import Heuristica, ZeroHeuristica, HeuristicaEuclidiana
 
 __all__ = [
-    'FuncaoCusto', 'CustoDefault', 'CustoTempoPercurso', 'CustoAmbientalTempo'
+    'FuncaoCusto', 'CustoDefault', 'CustoTempoPercurso', 'CustoAmbientalTempo',
     'Heuristica', 'ZeroHeuristica', 'HeuristicaEuclidiana'
 ]
@@ -11,11 +11,29 @@ class FuncaoCusto:
     Implementações devem fornecer `custo_rota(grafo, rota, veiculo)` que
     devolve o custo total de uma rota, e `custo_aresta(aresta, veiculo)` que
     devolve o custo de uma aresta individual.
+
+    As implementações declaram `__slots__`: são consultadas em todos os ciclos de
+    procura e alocação e não precisam de um `__dict__` por instância.
     """
 
+    __slots__ = ()
+
+    # Se o custo de uma rota depende do veículo. Quando não depende, o custo da
+    # mesma rota pode ser calculado uma vez e reutilizado para todos os veículos.
+    depende_do_veiculo = True
+
     def custo_rota(self, grafo, rota: List[str], veiculo: Optional[object]) -> float:
         raise NotImplementedError()
 
+    def custo_rota_com_distancia(self, grafo, rota: List[str], distancia_km: float,
+                                 veiculo: Optional[object] = None) -> float:
+        """Custo de uma rota cuja distância (km) já é conhecida.
+
+        Por defeito calcula `custo_rota`; funções de custo que dependem apenas da
+        distância usam-na diretamente sem voltar a percorrer a rota.
+        """
+        return self.custo_rota(grafo, rota, veiculo)
+
     def custo_aresta(self, aresta, veiculo: Optional[object]) -> float:
         raise NotImplementedError()
 
@@ -23,24 +41,32 @@ class FuncaoCusto:
 class CustoDefault(FuncaoCusto):
     """Custo por defeito baseado na soma das distâncias das arestas (km)."""
 
+    __slots__ = ()
+
+    depende_do_veiculo = False
+
     def custo_rota(self, grafo, rota: List[str], veiculo: Optional[object] = None) -> float:
-        distancia = 0.0
         if not rota or len(rota) < 2:
             return 0.0
-        for i in range(len(rota) - 1):
-            aresta = grafo.getEdge(rota[i], rota[i + 1])
+        # Soma vetorial sobre os pesos pré-calculados do CSR do grafo
+        distancia = grafo.get_csr().quilometros_rota(rota)
+        if distancia is not None:
+            return distancia
+
+        distancia = 0.0
+        get_aresta = grafo.getEdge
+        for a, b in zip(rota, rota[1:]):
+            aresta = get_aresta(a, b)
             if aresta:
-                try:
-                    distancia += self.custo_aresta(aresta, veiculo)
-                except Exception:
-                    pass
+                distancia += aresta.km
         return distancia
 
+    def custo_rota_com_distancia(self, grafo, rota: List[str], distancia_km: float,
+                                 veiculo: Optional[object] = None) -> float:
+        return distancia_km
+
     def custo_aresta(self, aresta, veiculo: Optional[object] = None) -> float:
-        try:
-            return float(aresta.getQuilometro())
-        except Exception:
-            return 0.0
+        return aresta.km
 
 
 class CustoTempoPercurso(FuncaoCusto):
@@ -50,27 +76,37 @@ class CustoTempoPercurso(FuncaoCusto):
     Arestas com acidente (retornam None) são penalizadas com custo infinito.
     """
 
+    __slots__ = ()
+
+    depende_do_veiculo = False
+
     def custo_rota(self, grafo, rota: List[str], veiculo: Optional[object] = None) -> float:
-        tempo_total = 0.0
         if not rota or len(rota) < 2:
             return 0.0
-        for i in range(len(rota) - 1):
-            aresta = grafo.getEdge(rota[i], rota[i + 1])
+        # Soma vetorial: uma aresta com acidente (inf) torna a rota impossível
+        # (os tempos das arestas ficam guardados no CSR do grafo, por versão)
+        csr = grafo.get_csr()
+        tempo_total = csr.somar_rota(csr.pesos_array(self, grafo.versao), rota)
+        if tempo_total is not None:
+            return tempo_total
+
+        tempo_total = 0.0
+        get_aresta = grafo.getEdge
+        for a, b in zip(rota, rota[1:]):
+            aresta = get_aresta(a, b)
             if aresta:
-                custo = self.custo_aresta(aresta, veiculo)
-                if custo == float('inf'):
+                # custo_aresta em linha, sem uma chamada de método por aresta
+                tempo = aresta.getTempoPercorrer()
+                if tempo is None:
                     return float('inf')  # Rota impossível devido a acidente
-                tempo_total += custo
+                tempo_total += tempo
         return tempo_total
 
     def custo_aresta(self, aresta, veiculo: Optional[object] = None) -> float:
-        try:
-            tempo = aresta.getTempoPercorrer()
-            if tempo is None:  # Acidente na aresta
-                return float('inf')
-            return float(tempo)
-        except Exception:
-            return 0.0
+        tempo = aresta.getTempoPercorrer()
+        if tempo is None:  # Acidente na aresta
+            return float('inf')
+        return tempo
 
 
 class CustoAmbientalTempo(FuncaoCusto):
@@ -80,12 +116,15 @@ class CustoAmbientalTempo(FuncaoCusto):
     Arestas com acidente (retornam None) são penalizadas com custo infinito.
     """
 
+    __slots__ = ()
+
     def custo_rota(self, grafo, percentagemAmbiental, rota: List[str], veiculo: Optional[object] = None) -> float:
         tempo_total = 0.0
         if not rota or len(rota) < 2:
             return 0.0
-        for i in range(len(rota) - 1):
-            aresta = grafo.getEdge(rota[i], rota[i + 1])
+        get_aresta = grafo.getEdge
+        for a, b in zip(rota, rota[1:]):
+            aresta = get_aresta(a, b)
             if aresta:
                 custo = self.custo_aresta(aresta, veiculo, percentagemAmbiental)
                 if custo == float('inf'):
@@ -2,44 +2,133 @@
 import math
 from typing import Optional
 
+import numpy as np
+
 
 class Heuristica:
     """Interface para heurísticas de busca.
 
     Implementações devem fornecer `estimativa(grafo, origem, destino)` que
     devolve uma estimativa (lower-bound) do custo entre dois nós.
+
+    As implementações declaram `__slots__` (sem `__dict__` por instância).
     """
 
+    __slots__ = ()
+
     def estimativa(self, grafo, origem: str, destino: str) -> float:
         raise NotImplementedError()
 
+    def estimativa_ordem(self, grafo, origem: str, destino: str) -> float:
+        """Valor com a mesma ordem de `estimativa`, para quando só se comparam nós.
+
+        Não serve de limite inferior do custo (não pode ser somado a g). Por
+        omissão é a própria estimativa.
+        """
+        return self.estimativa(grafo, origem, destino)
+
+    def estimativas_por_no(self, grafo, destino: str) -> Optional[np.ndarray]:
+        """Estimativa de todos os nós até `destino`, calculada de uma só vez.
+
+        Returns:
+            Array indexado pelos índices de `grafo.get_csr()`, ou None se a
+            heurística não suportar o cálculo em lote (usa-se então `estimativa`)
+        """
+        return None
+
 
 class ZeroHeuristica(Heuristica):
     """Heurística neutra (retorna zero)."""
 
+    __slots__ = ()
+
     def estimativa(self, grafo, origem: str, destino: str) -> float:
         return 0.0
 
+    def estimativas_por_no(self, grafo, destino: str) -> Optional[np.ndarray]:
+        return np.zeros(len(grafo.get_csr()))
+
 
 class HeuristicaEuclidiana(Heuristica):
-    """Heurística baseada na distância euclidiana (distância em linha reta) entre dois nós."""
+    """Heurística baseada na distância euclidiana (distância em linha reta) entre dois nós.
+
+    As estimativas são memorizadas por origem enquanto o destino (e o grafo) se
+    mantiverem: as procuras informadas e os alocadores pedem repetidamente a
+    distância de vários nós ao mesmo destino.
+    """
+
+    __slots__ = ('_cache', '_quadrados', '_csr', '_destino', '_coords_destino')
+
+    def __init__(self):
+        self._cache = {}  # origem -> estimativa, para o destino atual
+        self._quadrados = {}  # origem -> distância ao quadrado, para o destino atual
+        self._csr = None  # CSR do grafo a que a cache se refere (comparado com `is`)
+        self._destino = None  # destino a que a cache se refere
+        self._coords_destino = None  # (x, y) do destino, ou None se desconhecidas
 
     def estimativa(self, grafo, origem: str, destino: str) -> float:
-        try:
-            node_o = grafo.get_node_by_name(origem)
-            node_d = grafo.get_node_by_name(destino)
+        self._preparar_destino(grafo, destino)
+
+        h = self._cache.get(origem)
+        if h is None:
+            h = math.sqrt(self._quadrado(grafo, origem))
+            self._cache[origem] = h
+        return h
+
+    def estimativa_ordem(self, grafo, origem: str, destino: str) -> float:
+        """Distância euclidiana ao quadrado: mesma ordem, sem raiz quadrada."""
+        self._preparar_destino(grafo, destino)
+        return self._quadrado(grafo, origem)
+
+    def estimativas_por_no(self, grafo, destino: str) -> Optional[np.ndarray]:
+        """Distâncias euclidianas de todos os nós ao destino numa única operação vetorial.
+
+        Nós sem coordenadas (ou um destino sem coordenadas) ficam com 0.
+        """
+        csr = grafo.get_csr()
+        j = csr.indice(destino)
+        if j is None:
+            return np.zeros(len(csr))
+
+        h = np.hypot(csr.coords_x - csr.coords_x[j], csr.coords_y - csr.coords_y[j])
+        return np.nan_to_num(h, nan=0.0, copy=False)
+
+    def _preparar_destino(self, grafo, destino: str):
+        # O CSR é reconstruído quando o grafo muda de estrutura, e um grafo novo
+        # tem sempre um CSR novo: guardá-lo evita confundir grafos com o mesmo id
+        csr = grafo.get_csr()
+        if csr is not self._csr or destino != self._destino:
+            self._cache = {}
+            self._quadrados = {}
+            self._csr = csr
+            self._destino = destino
+            self._coords_destino = self._coordenadas(grafo, destino)
 
-            if node_o is None or node_d is None:
-                return 0.0
+    def _quadrado(self, grafo, origem: str) -> float:
+        q = self._quadrados.get(origem)
+        if q is None:
+            q = 0.0
+            coords_origem = self._coordenadas(grafo, origem)
+            if self._coords_destino is not None and coords_origem is not None:
+                dx = self._coords_destino[0] - coords_origem[0]
+                dy = self._coords_destino[1] - coords_origem[1]
+                q = float(dx * dx + dy * dy)
+            self._quadrados[origem] = q
+        return q
 
-            x1 = node_o.getX()
-            y1 = node_o.getY()
-            x2 = node_d.getX()
-            y2 = node_d.getY()
+    @staticmethod
+    def _coordenadas(grafo, nome: str):
+        """(x, y) do nó, ou None se o nó não existir ou não tiver coordenadas.
 
-            if x1 is None or y1 is None or x2 is None or y2 is None:
-                return 0.0
+        Lidas dos arrays de coordenadas do CSR do grafo, indexados pelo nó.
+        """
+        csr = grafo.get_csr()
+        i = csr.indice(nome)
+        if i is None:
+            return None
 
-            return float(math.hypot(x2 - x1, y2 - y1))
-        except Exception:
-            return 0.0
+        x = float(csr.coords_x[i])
+        y = float(csr.coords_y[i])
+        if math.isnan(x) or math.isnan(y):
+            return None
+        return (x, y)
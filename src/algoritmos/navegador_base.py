@@ -3,11 +3,16 @@ Interface base para algoritmos de navegação/procura de caminhos.
 Todos os algoritmos de navegação devem herdar desta classe.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from collections import OrderedDict
+from typing import Callable, Optional, List, Dict, Tuple
 
 from infra.grafo.grafo import Grafo
 from algoritmos.criterios import FuncaoCusto, Heuristica, CustoDefault, ZeroHeuristica
 
+# Critérios por omissão, sem estado: partilhados por todos os navegadores e alocadores
+CUSTO_DEFAULT = CustoDefault()
+HEURISTICA_ZERO = ZeroHeuristica()
+
 
 class NavegadorBase(ABC):
     """
@@ -18,6 +23,13 @@ class NavegadorBase(ABC):
     (BFS, DFS, Dijkstra, A*, etc.).
     """
 
+    # Número máximo de pares (origem, destino) guardados na cache de rotas
+    TAMANHO_CACHE_ROTAS = 65536
+
+    # Se `calcular_rota` devolve sempre um caminho mínimo (em arestas ou em custo).
+    # Os alocadores dependem disto para avaliar autonomia e custo dos veículos.
+    ROTAS_MINIMAS = True
+
     def __init__(
             self,
             funcao_custo: Optional[FuncaoCusto] = None,
@@ -27,8 +39,15 @@ class NavegadorBase(ABC):
         Estas dependências podem ser usadas por implementações (ex.: A*) que
         queiram consultar estimativas e custos personalizados.
         """
-        self.funcao_custo: FuncaoCusto = funcao_custo if funcao_custo is not None else CustoDefault()
-        self.heuristica: Heuristica = heuristica if heuristica is not None else ZeroHeuristica()
+        self.funcao_custo: FuncaoCusto = funcao_custo if funcao_custo is not None else CUSTO_DEFAULT
+        self.heuristica: Heuristica = heuristica if heuristica is not None else HEURISTICA_ZERO
+
+        # Cache LRU {(origem, destino): (rota, distancia)} válida para um único
+        # estado do grafo/função de custo (ver `calcular_rota_em_cache`)
+        self._cache_rotas: OrderedDict = OrderedDict()
+        # (grafo, versao, funcao_custo) a que a cache se refere; guarda-se o
+        # próprio grafo (e não o seu id) para nunca a reutilizar noutro grafo
+        self._cache_estado = None
 
     @abstractmethod
     def calcular_rota(self, grafo: Grafo, origem: str, destino: str) -> Optional[List[str]]:
@@ -46,7 +65,150 @@ class NavegadorBase(ABC):
         """
         pass
 
+    def calcular_rota_em_cache(self, grafo: Grafo, origem: str,
+                               destino: str) -> Tuple[Optional[List[str]], Optional[float]]:
+        """Calcula (ou reutiliza) a rota entre origem e destino e a sua distância.
+
+        Os alocadores repetem as mesmas consultas para todos os veículos e entre
+        pedidos; o resultado fica guardado enquanto o grafo não mudar
+        (`grafo.versao`) e a função de custo for a mesma.
+
+        As listas devolvidas são partilhadas entre chamadas e não devem ser
+        modificadas.
+
+        Returns:
+            Tupla (rota, distancia_km), ou (None, None) se não existir caminho
+        """
+        self._validar_cache_rotas(grafo)
+
+        chave = (origem, destino)
+        entrada = self._cache_rotas.get(chave)
+        if entrada is not None:
+            self._cache_rotas.move_to_end(chave)
+            return entrada
+
+        return self._guardar_em_cache(grafo, chave, self.calcular_rota(grafo, origem, destino))
+
+    def calcular_rotas_para_destino(
+            self, grafo: Grafo, destino: str,
+            origens: List[str]) -> Dict[str, Tuple[Optional[List[str]], Optional[float]]]:
+        """Calcula as rotas de várias origens para um mesmo destino.
+
+        É o padrão dos alocadores (todos os veículos -> origem do pedido). As
+        entradas já em cache são reutilizadas e as restantes são calculadas de
+        uma vez por `_rotas_para_destino`, que cada navegador pode especializar
+        (ex.: uma única procura invertida a partir do destino).
+
+        Returns:
+            Dicionário {origem: (rota, distancia_km)}, com (None, None) para as
+            origens sem caminho
+        """
+        self._validar_cache_rotas(grafo)
+
+        resultado = {}
+        em_falta = []
+        for origem in origens:
+            if origem in resultado:
+                continue
+            entrada = self._cache_rotas.get((origem, destino))
+            if entrada is None:
+                em_falta.append(origem)
+                resultado[origem] = None
+            else:
+                resultado[origem] = entrada
+
+        if em_falta:
+            rotas = self._rotas_para_destino(grafo, destino, em_falta)
+            for origem in em_falta:
+                resultado[origem] = self._guardar_em_cache(
+                    grafo, (origem, destino), rotas.get(origem))
+
+        return resultado
+
+    def _rotas_para_destino(self, grafo: Grafo, destino: str,
+                            origens: List[str]) -> Dict[str, Optional[List[str]]]:
+        """Rotas de cada origem até ao destino (por omissão, uma procura por origem)."""
+        return {origem: self.calcular_rota(grafo, origem, destino) for origem in origens}
+
+    def _validar_cache_rotas(self, grafo: Grafo):
+        """Esvazia a cache se o grafo, a sua versão ou a função de custo mudaram."""
+        estado = self._cache_estado
+        if (estado is None or estado[0] is not grafo or estado[1] != grafo.versao
+                or estado[2] is not self.funcao_custo):
+            self._cache_rotas.clear()
+            self._cache_estado = (grafo, grafo.versao, self.funcao_custo)
+
+    def _guardar_em_cache(self, grafo: Grafo, chave: Tuple[str, str],
+                          rota: Optional[List[str]]) -> Tuple[Optional[List[str]], Optional[float]]:
+        if rota is None:
+            entrada = (None, None)
+        else:
+            entrada = (rota, grafo.calcular_distancia_rota(rota))
+
+        self._cache_rotas[chave] = entrada
+        if len(self._cache_rotas) > self.TAMANHO_CACHE_ROTAS:
+            self._cache_rotas.popitem(last=False)
+        return entrada
+
     @abstractmethod
     def nome_algoritmo(self) -> str:
         """Retorna o nome do algoritmo para identificação."""
         pass
+
+    @staticmethod
+    def _reconstruir_caminho(pais: Dict[str, Optional[str]], destino: str) -> List[str]:
+        """Reconstrói o caminho origem -> destino a partir de um mapa de predecessores.
+
+        Args:
+            pais: Mapa nó -> predecessor (a origem tem predecessor None)
+            destino: Nó final do caminho
+
+        Returns:
+            Lista com os nomes dos nós desde a origem até ao destino
+        """
+        caminho = []
+        no = destino
+        while no is not None:
+            caminho.append(no)
+            no = pais[no]
+        caminho.reverse()
+        return caminho
+
+    def _pesos_arestas_csr(self, grafo: Grafo, veiculo: Optional[object] = None) -> List[float]:
+        """Custo de cada aresta de `grafo.get_csr()`, pela ordem de `csr.arestas`.
+
+        Quando o custo não depende do veículo, usa-se a lista guardada no próprio
+        CSR (`GrafoCSR.pesos`), reutilizada enquanto o grafo não mudar.
+        """
+        csr = grafo.get_csr()
+        if veiculo is not None and self.funcao_custo.depende_do_veiculo:
+            custo_aresta = self.funcao_custo.custo_aresta
+            return [custo_aresta(a, veiculo) for a in csr.arestas]
+
+        return csr.pesos(self.funcao_custo, grafo.versao)
+
+    def _heuristica_memorizada(self, grafo: Grafo, destino: str,
+                               so_ordem: bool = False) -> Callable[[str], float]:
+        """Devolve h(no) para um destino fixo, calculando cada estimativa uma só vez.
+
+        A memória vive apenas durante uma consulta: h(no) não muda para o mesmo
+        destino, mas um nó pode ser relaxado várias vezes.
+
+        Args:
+            so_ordem: Se h só é usada para ordenar nós (nunca somada a g), usa
+                `Heuristica.estimativa_ordem`, que pode evitar trabalho (ex.: raízes)
+        """
+        estimativas: Dict[str, float] = {}
+        if so_ordem:
+            estimativa = self.heuristica.estimativa_ordem
+        else:
+            estimativa = self.heuristica.estimativa
+
+        def h(no: str) -> float:
+            valor = estimativas.get(no)
+            if valor is None:
+                valor = estimativa(grafo, no, destino)
+                estimativas[no] = valor
+            return valor
+
+        return h
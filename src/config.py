@@ -4,7 +4,9 @@ from dotenv import load_dotenv
 from typing import Optional
 
 from infra.policies.recarga_policy import RecargaAutomaticaPolicy, SemRecargaPolicy, RecargaDuranteViagemPolicy
-from algoritmos.algoritmos_navegacao import NavegadorBFS, NavegadorCustoUniforme, NavegadorDFS
+from algoritmos.algoritmos_navegacao import (
+    NavegadorBFS, NavegadorCustoUniforme, NavegadorDFS, NavegadorCH
+)
 from algoritmos.algoritmos_alocacao import AlocadorHeuristico, AlocadorSimples, AlocadorPorCusto, AlocadorAEstrela
 from infra.policies.reposicionamento_policy import ReposicionamentoAtratividade, ReposicionamentoEstatistico, ReposicionamentoNulo
 from infra.policies.ridesharing_policy import SimplesRideSharingPolicy, SemRideSharingPolicy
@@ -14,6 +16,49 @@ from algoritmos.criterios import ZeroHeuristica, HeuristicaEuclidiana
 # Carregar variáveis de ambiente do ficheiro .env
 load_dotenv()
 
+# Opções disponíveis para cada componente configurável (nome -> classe)
+FUNCOES_CUSTO = {
+    'default': CustoDefault,
+    'tempo': CustoTempoPercurso,
+    'ambiental': CustoAmbientalTempo
+}
+
+HEURISTICAS = {
+    'zero': ZeroHeuristica,
+    'euclidiana': HeuristicaEuclidiana,
+}
+
+NAVEGADORES = {
+    "bfs": NavegadorBFS,
+    "dfs": NavegadorDFS,
+    "ucs": NavegadorCustoUniforme,
+    "ch": NavegadorCH,
+}
+
+ALOCADORES = {
+    "heuristico": AlocadorHeuristico,
+    "simples": AlocadorSimples,
+    "custo": AlocadorPorCusto,
+    "aestrela": AlocadorAEstrela,
+}
+
+POLITICAS_RIDE_SHARING = {
+    'simples': SimplesRideSharingPolicy,
+    'sem': SemRideSharingPolicy,
+}
+
+POLITICAS_RECARGA = {
+    'automatica': RecargaAutomaticaPolicy,
+    'durante_viagem': RecargaDuranteViagemPolicy,
+    'sem': SemRecargaPolicy,
+}
+
+POLITICAS_REPOSICIONAMENTO = {
+    'nulo': ReposicionamentoNulo,
+    'atratividade': ReposicionamentoAtratividade,
+    'estatistico': ReposicionamentoEstatistico,
+}
+
 
 class Config:
     """Classe centralizada para todas as configurações da simulação."""
@@ -62,11 +107,7 @@ class Config:
         """Retorna a função de custo especificada (instância)."""
 
         nome = (nome or self.FUNCAO_CUSTO).lower()
-        opcoes = {
-            'default': CustoDefault,
-            'tempo': CustoTempoPercurso,
-            'ambiental': CustoAmbientalTempo
-        }
+        opcoes = FUNCOES_CUSTO
 
         func_class = opcoes.get(nome)
         if func_class is None:
@@ -81,10 +122,7 @@ class Config:
         """Retorna a heurística especificada (instância)."""
 
         nome = (nome or self.HEURISTICA).lower()
-        opcoes = {
-            'zero': ZeroHeuristica,
-            'euclidiana': HeuristicaEuclidiana,
-        }
+        opcoes = HEURISTICAS
 
         heur_class = opcoes.get(nome)
         if heur_class is None:
@@ -103,11 +141,7 @@ class Config:
         """Retorna o navegador especificado."""
 
         nome = nome or self.ALGORITMO_NAVEGACAO
-        navegadores = {
-            "bfs": NavegadorBFS,
-            "dfs": NavegadorDFS,
-            "ucs": NavegadorCustoUniforme,
-        }
+        navegadores = NAVEGADORES
 
         navegador_class = navegadores.get(nome.lower())
         if navegador_class is None:
@@ -127,12 +161,7 @@ class Config:
         """Retorna o alocador especificado."""
 
         nome = nome or self.ALGORITMO_ALOCACAO
-        alocadores = {
-            "heuristico": AlocadorHeuristico,
-            "simples": AlocadorSimples,
-            "custo": AlocadorPorCusto,
-            "aestrela": AlocadorAEstrela,
-        }
+        alocadores = ALOCADORES
 
         alocador_class = alocadores.get(nome.lower())
         if alocador_class is None:
@@ -140,6 +169,14 @@ class Config:
             print(f"Use: {', '.join(alocadores.keys())}")
             sys.exit(1)
 
+        # A alocação avalia autonomia e custo pelas rotas do navegador: com um
+        # navegador que não devolve rotas mínimas (ex.: DFS), os veículos são
+        # avaliados com Custo Uniforme (as viagens continuam a usar o navegador)
+        if not navegador.ROTAS_MINIMAS:
+            print(f"[Config] {navegador.nome_algoritmo()} não devolve rotas mínimas: "
+                  "o alocador usa Custo Uniforme para avaliar os veículos")
+            navegador = NavegadorCustoUniforme(navegador.funcao_custo, navegador.heuristica)
+
          # Instanciar alocador com navegador, função de custo e heurística
         return alocador_class(navegador, funcao_custo, heuristica)
 
@@ -200,14 +237,10 @@ class Config:
     def get_ride_sharing_policy(self) -> Optional[object]:
         """Retorna a política de ride-sharing configurada ou None."""
 
-        # Dicionário com as políticas disponíveis
-        policies = {
-            'simples': SimplesRideSharingPolicy,
-            'sem': SemRideSharingPolicy,
-        }
+        policies = POLITICAS_RIDE_SHARING
 
         nome_politica = os.getenv('POLITICA_RIDE_SHARING', 'simples')
-        policy_class = policies[nome_politica.lower()]
+        policy_class = policies.get(nome_politica.lower())
         if policy_class is None:
             print(f"Política de ride-sharing inválida: '{nome_politica}'")
             print(f"Use: {', '.join(policies.keys())}")
@@ -219,14 +252,10 @@ class Config:
     def get_recarga_policy(self):
         """Retorna a política de recarga configurada."""
 
-        policies = {
-            'automatica': RecargaAutomaticaPolicy,
-            'durante_viagem': RecargaDuranteViagemPolicy,
-            'sem': SemRecargaPolicy,
-        }
+        policies = POLITICAS_RECARGA
 
         nome_politica = os.getenv('POLITICA_RECARGA', 'automatica')
-        policy_class = policies[nome_politica.lower()]
+        policy_class = policies.get(nome_politica.lower())
         if policy_class is None:
             print(f"Política de recarga inválida: '{nome_politica}'")
             print(f"Use: {', '.join(policies.keys())}")
@@ -239,14 +268,10 @@ class Config:
     def get_reposicionamento_policy(self):
         """Retorna a política de reposicionamento configurada."""
 
-        policies = {
-            'nulo': ReposicionamentoNulo,
-            'atratividade': ReposicionamentoAtratividade,
-             'estatistico': ReposicionamentoEstatistico,  
-        }
+        policies = POLITICAS_REPOSICIONAMENTO
 
         nome_politica = os.getenv('POLITICA_REPOSICIONAMENTO', 'nulo')
-        policy_class = policies[nome_politica.lower()]
+        policy_class = policies.get(nome_politica.lower())
         if policy_class is None:
             print(f"Política de reposicionamento inválida: '{nome_politica}'")
             print(f"Use: {', '.join(policies.keys())}")
@@ -13,6 +13,9 @@ class DashboardWindow:
       - Logs de eventos
     """
 
+    # Máximo de mensagens lidas da fila por ciclo, para não bloquear o Tk
+    MAX_MENSAGENS_POR_CICLO = 64
+
     def __init__(self, command_queue: queue.Queue):
         self.command_queue = command_queue
 
@@ -22,13 +25,14 @@ class DashboardWindow:
         self.root.geometry("600x700")
 
         # --- Dados ---
-        self.logs = []
-        self.max_logs = 100
+        self.max_logs = 100  # linhas mantidas no painel de logs
         self.tempo_simulacao = "--:--:--"
         self.viagens_ativas = {}
+        self._linhas_tabela = {}  # iid -> valores mostrados na tabela de viagens
         self.pedidos_atendidos = 0
         self.pedidos_rejeitados = 0
         self.veiculos_disponiveis = 0
+        self._alterado = True  # há dados novos por mostrar
 
         # --- Layout principal ---
         self._criar_widgets()
@@ -92,8 +96,11 @@ class DashboardWindow:
     def _check_queue(self):
         """Lê a fila de mensagens do simulador."""
         try:
-            while not self.command_queue.empty():
-                msg = self.command_queue.get_nowait()
+            for _ in range(self.MAX_MENSAGENS_POR_CICLO):
+                try:
+                    msg = self.command_queue.get_nowait()
+                except queue.Empty:
+                    break
                 self._processar_mensagem(msg)
         except Exception as e:
             self._adicionar_log(f"[ERRO] {e}")
@@ -102,6 +109,7 @@ class DashboardWindow:
     def _processar_mensagem(self, msg):
         """Processa cada mensagem vinda do simulador."""
         tipo = msg.get("type")
+        self._alterado = True
 
         if tipo == "update_time":
             tempo = msg.get("tempo")
@@ -141,7 +149,12 @@ class DashboardWindow:
             self.root.after(1000, self.root.destroy)
 
     def _atualizar_display(self):
-        """Atualiza todos os widgets."""
+        """Atualiza todos os widgets (só se chegaram mensagens desde a última vez)."""
+        if not self._alterado:
+            self.root.after(500, self._atualizar_display)
+            return
+        self._alterado = False
+
         # Atualizar texto
         self.lbl_tempo.config(text=f"Tempo: {self.tempo_simulacao}")
         self.lbl_viagens.config(text=f"Viagens ativas: {len(self.viagens_ativas)}")
@@ -153,16 +166,25 @@ class DashboardWindow:
         taxa = (self.pedidos_atendidos / total * 100) if total > 0 else 0.0
         self.lbl_taxa.config(text=f"Taxa de sucesso: {taxa:.1f}%")
 
-        # Atualizar tabela de viagens
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Atualizar tabela de viagens: só as linhas novas, alteradas ou removidas
+        linhas = {}
         for vid, veic in self.viagens_ativas.items():
             if hasattr(veic, "rota_viagem"):
                 origem = veic.rota_viagem[0]
                 destino = getattr(veic, "destino", veic.rota_viagem[-1])
                 progresso = f"{getattr(veic, 'progresso_viagem', 0.0):.1%}"
                 pid = getattr(veic, "pedido_id", "?")
-                self.tree.insert("", "end", values=(vid, pid, origem, destino, progresso))
+                linhas[str(vid)] = (vid, pid, origem, destino, progresso)
+
+        for iid in self._linhas_tabela.keys() - linhas.keys():
+            self.tree.delete(iid)
+        for iid, valores in linhas.items():
+            anteriores = self._linhas_tabela.get(iid)
+            if anteriores is None:
+                self.tree.insert("", "end", iid=iid, values=valores)
+            elif anteriores != valores:
+                self.tree.item(iid, values=valores)
+        self._linhas_tabela = linhas
 
         self.root.after(500, self._atualizar_display)
 
@@ -170,11 +192,12 @@ class DashboardWindow:
         """Adiciona uma linha ao painel de logs."""
         timestamp = datetime.now().strftime("%H:%M:%S")
         entry = f"[{timestamp}] {texto}\n"
-        self.logs.append(entry)
-        if len(self.logs) > self.max_logs:
-            self.logs.pop(0)
+        # Só se acrescenta a nova linha (sem reescrever o painel inteiro) e
+        # removem-se as mais antigas quando passa de `max_logs`
         self.txt_logs.config(state="normal")
-        self.txt_logs.delete("1.0", tk.END)
-        self.txt_logs.insert(tk.END, "".join(self.logs))
+        self.txt_logs.insert(tk.END, entry)
+        excesso = int(self.txt_logs.index("end-1c").split(".")[0]) - 1 - self.max_logs
+        if excesso > 0:
+            self.txt_logs.delete("1.0", f"{excesso + 1}.0")
         self.txt_logs.config(state="disabled")
         self.txt_logs.see(tk.END)
@@ -1,118 +1,171 @@
 from matplotlib.patches import Circle
+from matplotlib.collections import LineCollection, PatchCollection
+import numpy as np
 import math
 
 
 class GraphDrawer:
     """Responsável por desenhar elementos do grafo."""
 
+    # Acima deste número de nós não se desenham labels
+    LABEL_THRESHOLD = 300
+    # Raio mínimo (pixels) dos nós para os labels ficarem visíveis
+    LABEL_MIN_PIXEL_RADIUS = 8
+
     def __init__(self):
-        self.edge_lines = {}
-        self.node_patches = {}
+        self.edge_collection = None  # todas as arestas num único artista
+        self._edge_u = np.empty(0, dtype=np.intp)  # índice do nó de origem de cada aresta
+        self._edge_v = np.empty(0, dtype=np.intp)  # índice do nó de destino de cada aresta
+        self.node_collection = None  # círculos de todos os nós num único artista
+        self._node_radius = 0.0
         self.node_texts = {}
-        self.vehicle_markers = {}
-
-    def compute_node_radius(self, pos, relative_factor=0.03, min_radius=0.01, max_radius=0.18):
-        """Calcula raio apropriado para nós."""
-        xs = [p[0] for p in pos.values()] if pos else [0.0]
-        ys = [p[1] for p in pos.values()] if pos else [0.0]
-        xrange = (max(xs) - min(xs)) if xs else 1.0
-        yrange = (max(ys) - min(ys)) if ys else 1.0
+        self._labels_cid = None  # callback de xlim_changed que mostra/esconde labels
+        self.vehicle_scatter = None  # marcadores de todos os veículos num único artista
+        self._vehicle_colors = []
+        self._vehicle_indices = []
+        self._colors_by_class = {}  # classe do veículo -> cor do marcador
+
+    def compute_node_radius(self, xs, ys, relative_factor=0.03, min_radius=0.01, max_radius=0.18):
+        """Calcula raio apropriado para nós (xs, ys: arrays com as coordenadas dos nós)."""
+        xrange = float(xs.max() - xs.min()) if len(xs) else 0.0
+        yrange = float(ys.max() - ys.min()) if len(ys) else 0.0
         span = max(xrange, yrange, 1e-6)
         r = span * relative_factor
         return max(min_radius, min(max_radius, r))
 
-    def draw_edges(self, ax, G, pos):
-        """Desenha arestas."""
-        self.edge_lines = {}
-        for u, v in G.edges():
-            x1, y1 = pos[u]
-            x2, y2 = pos[v]
-            line = ax.plot([x1, x2], [y1, y2], color="gray", linewidth=1.2, zorder=1)[0]
-            self.edge_lines[(u, v)] = line
-
-    def draw_nodes(self, ax, G, pos):
-        """Desenha nós com labels."""
-        self.node_patches = {}
+    @staticmethod
+    def edge_segments(xs, ys, u, v):
+        """Segmentos (N, 2, 2) das arestas com extremos nos índices u e v."""
+        segs = np.empty((len(u), 2, 2))
+        segs[:, 0, 0] = xs[u]
+        segs[:, 0, 1] = ys[u]
+        segs[:, 1, 0] = xs[v]
+        segs[:, 1, 1] = ys[v]
+        return segs
+
+    def draw_edges(self, ax, G, node_index, xs, ys):
+        """Desenha todas as arestas como uma única LineCollection."""
+        self._edge_u = np.fromiter((node_index[u] for u, _ in G.edges()), dtype=np.intp,
+                                   count=G.number_of_edges())
+        self._edge_v = np.fromiter((node_index[v] for _, v in G.edges()), dtype=np.intp,
+                                   count=G.number_of_edges())
+        self.edge_collection = LineCollection(
+            self.edge_segments(xs, ys, self._edge_u, self._edge_v),
+            colors="gray", linewidths=1.2, zorder=1)
+        ax.add_collection(self.edge_collection)
+
+    @staticmethod
+    def _node_circles(xs, ys, node_radius):
+        return [Circle((x, y), node_radius) for x, y in zip(xs.tolist(), ys.tolist())]
+
+    def draw_nodes(self, ax, G, node_index, xs, ys, node_radius):
+        """Desenha nós (uma única PatchCollection) com labels."""
         self.node_texts = {}
-        node_radius = self.compute_node_radius(pos)
-
-        for n, (x, y) in pos.items():
-            # Círculo do nó
-            circ = Circle((x, y), node_radius, zorder=2, ec="black", lw=0.8, facecolor="lightblue")
-            ax.add_patch(circ)
-            self.node_patches[n] = circ
-
-            # Tamanho de fonte adaptativo
-            try:
-                trans = ax.transData.transform
-                px_center = trans((x, y))
-                px_edge = trans((x + node_radius, y))
-                pixel_radius = abs(px_edge[0] - px_center[0])
-                fontsize = max(6, min(12, int(pixel_radius * 0.5)))
-            except Exception:
-                fontsize = 8
+        self._node_radius = node_radius
+        self.node_collection = PatchCollection(
+            self._node_circles(xs, ys, node_radius),
+            facecolors="lightblue", edgecolors="black", linewidths=0.8, zorder=2)
+        ax.add_collection(self.node_collection)
+
+        if self._labels_cid is not None:
+            ax.callbacks.disconnect(self._labels_cid)
+            self._labels_cid = None
+        if len(node_index) > self.LABEL_THRESHOLD:
+            return
+
+        # Tamanho de fonte adaptativo (igual para todos os nós: o raio é o mesmo)
+        pixel_radius = self._pixel_radius(ax)
+        if pixel_radius is None:
+            fontsize = 8
+        else:
+            fontsize = max(6, min(12, int(pixel_radius * 0.5)))
 
+        for n, i in node_index.items():
             # Texto
             txt = ax.text(
-                x, y, str(n),
+                xs[i], ys[i], str(n),
                 ha="center", va="center", zorder=3,
                 fontsize=fontsize, color="black", weight="bold"
             )
             self.node_texts[n] = txt
 
-    def draw_vehicles(self, ax, pos, ambiente, node_radius):
-        """Desenha veículos nos nós."""
-        self.vehicle_markers = {}
-
+        self._update_label_visibility(ax)
+        self._labels_cid = ax.callbacks.connect("xlim_changed", self._update_label_visibility)
+
+    def _pixel_radius(self, ax):
+        """Raio dos nós em pixels, para a escala atual do eixo."""
+        try:
+            (x0, _), (x1, _) = ax.transData.transform([(0.0, 0.0), (self._node_radius, 0.0)])
+            return abs(x1 - x0)
+        except Exception:
+            return None
+
+    def _update_label_visibility(self, ax):
+        """Esconde os labels quando a vista está demasiado afastada para serem legíveis."""
+        pixel_radius = self._pixel_radius(ax)
+        visible = pixel_radius is None or pixel_radius >= self.LABEL_MIN_PIXEL_RADIUS
+        for txt in self.node_texts.values():
+            if txt.get_visible() != visible:
+                txt.set_visible(visible)
+
+    def _vehicle_color(self, v):
+        """Cor baseada no tipo (calculada uma vez por classe de veículo)."""
+        cls = v.__class__
+        color = self._colors_by_class.get(cls)
+        if color is None:
+            clsname = cls.__name__.lower()
+            color = "red" if ("eletric" in clsname or "eletrico" in clsname) else "orange"
+            self._colors_by_class[cls] = color
+        return color
+
+    def draw_vehicles(self, ax, node_index, xs, ys, ambiente, node_radius):
+        """Desenha veículos nos nós (um único scatter, atualizado com set_offsets).
+
+        Devolve True se algum veículo mudou de nó ou de cor desde a última chamada.
+        """
         if not ambiente:
-            return
+            return False
 
-        veiculos = ambiente.listar_veiculos()
-
-        for v in veiculos:
-            vid = v.id_veiculo
-            node_name = v.localizacao_atual
-
-            if node_name not in pos:
+        indices = []
+        colors = []
+        for v in ambiente.listar_veiculos():
+            i = node_index.get(v.localizacao_atual)
+            if i is None:
                 continue
-
-            x, y = pos[node_name]
-
-            # Cor baseada no tipo
-            try:
-                clsname = v.__class__.__name__.lower()
-                color = "red" if ("eletric" in clsname or "eletrico" in clsname) else "orange"
-            except Exception:
-                color = "orange"
-
-            # Criar ou atualizar marcador
-            if vid not in self.vehicle_markers:
-                marker, = ax.plot(
-                    [x], [y], marker="D", color=color, markersize=max(8, int(node_radius * 50)),
-                    markeredgecolor="black", markeredgewidth=1.5, zorder=5
-                )
-                self.vehicle_markers[vid] = marker
-            else:
-                self.vehicle_markers[vid].set_data([x], [y])
-
-    def update_positions(self, pos):
+            indices.append(i)
+            colors.append(self._vehicle_color(v))
+
+        # Criar o scatter (também depois de ax.cla()) ou só atualizar posições/cores
+        criar = self.vehicle_scatter is None or self.vehicle_scatter not in ax.collections
+        if not criar and indices == self._vehicle_indices and colors == self._vehicle_colors:
+            return False
+
+        offsets = np.column_stack((xs[indices], ys[indices]))
+        if criar:
+            markersize = max(8, int(node_radius * 50))
+            self.vehicle_scatter = ax.scatter(
+                offsets[:, 0], offsets[:, 1], c=colors or None, marker="D", s=markersize ** 2,
+                edgecolors="black", linewidths=1.5, zorder=5
+            )
+        else:
+            self.vehicle_scatter.set_offsets(offsets)
+            if colors != self._vehicle_colors:
+                self.vehicle_scatter.set_facecolors(colors)
+        self._vehicle_colors = colors
+        self._vehicle_indices = indices
+        return True
+
+    def update_positions(self, node_index, xs, ys):
         """Atualiza posições de todos os elementos."""
         # Arestas
-        for (u, v), line in self.edge_lines.items():
-            if u in pos and v in pos:
-                x1, y1 = pos[u]
-                x2, y2 = pos[v]
-                line.set_data([x1, x2], [y1, y2])
+        if self.edge_collection is not None:
+            self.edge_collection.set_segments(
+                self.edge_segments(xs, ys, self._edge_u, self._edge_v))
 
         # Nós
-        for n, circ in self.node_patches.items():
-            if n in pos:
-                x, y = pos[n]
-                circ.center = (x, y)
-                if n in self.node_texts:
-                    self.node_texts[n].set_position((x, y))
-
-        # Veículos
-        for vid, marker in self.vehicle_markers.items():
-            # A posição será atualizada por outro módulo se em movimento
-            pass
+        if self.node_collection is not None:
+            self.node_collection.set_paths(self._node_circles(xs, ys, self._node_radius))
+        for n, txt in self.node_texts.items():
+            i = node_index.get(n)
+            if i is not None:
+                txt.set_position((xs[i], ys[i]))
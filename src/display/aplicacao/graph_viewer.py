@@ -1,13 +1,15 @@
 """Viewer principal - integra os módulos."""
 
 from display.aplicacao.queue_handler import process_queue
-from display.aplicacao.layout_utils import compute_layout_best
+from display.aplicacao.layout_utils import compute_layout_best, compute_coordinate_arrays
 from display.aplicacao.interacoes import register_interactions
 from display.aplicacao.desenhar import GraphDrawer
 from display.aplicacao.viewport import Viewport
 import traceback
+import time
 from datetime import datetime
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 import tkinter as tk
@@ -19,6 +21,9 @@ matplotlib.use("TkAgg")
 class AnimatedGraphApp:
     """Viewer principal com modularização."""
 
+    # Intervalo mínimo entre redesenhos completos do canvas (~30 FPS)
+    REDRAW_INTERVAL = 1.0 / 30
+
     def __init__(self, grafo, ambiente, command_queue):
         print("[GraphViewer] Inicializando...")
 
@@ -53,6 +58,10 @@ class AnimatedGraphApp:
         # Aumentar espaçamento: aumenta k_factor de 6 para 12, e scale de 10 para 20
         self.pos = compute_layout_best(self.G, scale=2.0)
 
+        # Coordenadas em arrays paralelos (o layout não muda depois de calculado)
+        self._node_index, self._xs, self._ys = compute_coordinate_arrays(self.pos)
+        self.node_radius = self.drawer.compute_node_radius(self._xs, self._ys)
+
         # ========== INFORMAÇÕES DO CARRO ==========
         start_node = list(self.G.nodes())[0]
         sx, sy = self.pos[start_node]
@@ -69,6 +78,15 @@ class AnimatedGraphApp:
         }
         self.car_point = None
 
+        # Redesenhos pedidos entre frames são agrupados num só (ver `_request_redraw`)
+        self._redraw_pending = False
+        self._last_draw = 0.0
+
+        # Os artistas do grafo são criados uma vez (ver `_draw_complete_graph`)
+        self._initialized = False
+        self._route_collection = None  # rota destacada (substituída a cada destaque)
+        self._title = None
+
         # ========== DEBUG VEÍCULOS ==========
         if self.ambiente is not None:
             veiculos = self.ambiente.listar_veiculos()
@@ -83,94 +101,170 @@ class AnimatedGraphApp:
         self.interaction_handler.register(self.canvas, self.ax)
 
         # Aplicar auto-scale inicial
-        self.viewport.apply_auto_scale(self.ax, self.pos, margin=0.15)
+        self.viewport.apply_auto_scale(self.ax, self._xs, self._ys, margin=0.15)
 
         # ========== LOOPS ==========
         self.root.after(100, lambda: process_queue(self))
-        self.animation = FuncAnimation(self.fig, self._animation_step, interval=50, blit=False)
+        # Blitting: só os veículos são redesenhados em cada passo, sobre o fundo em cache
+        self.animation = FuncAnimation(self.fig, self._animation_step, interval=50, blit=True)
+        # O fundo em cache tem de ser capturado de novo após cada redesenho completo
+        self.canvas.mpl_connect("draw_event", self._on_full_draw)
 
         print("[GraphViewer] Inicialização completa")
 
-    def _draw_complete_graph(self):
-        """Desenha o grafo completo (primeira vez)."""
+    def _draw_complete_graph(self, rebuild=False):
+        """Desenha o grafo completo.
+
+        Os artistas (arestas, nós, labels, veículos) só são criados na primeira
+        chamada ou com `rebuild=True` (ex.: novo layout ou nova topologia); nas
+        restantes apenas se atualizam as posições dos existentes.
+        """
+        if self._initialized and not rebuild:
+            self.drawer.update_positions(self._node_index, self._xs, self._ys)
+            self._draw_vehicles()
+            self._update_car_point()
+            self._request_redraw()
+            return
+
         self.ax.cla()
+        self.car_point = None
+        self._title = None
         self.ax.grid(False)
         self.ax.set_aspect("equal", adjustable="datalim")
 
-        node_radius = self.drawer.compute_node_radius(self.pos)
+        node_radius = self.node_radius
 
         # Desenhar arestas, nós e veículos
-        self.drawer.draw_edges(self.ax, self.G, self.pos)
-        self.drawer.draw_nodes(self.ax, self.G, self.pos)
-        self.drawer.draw_vehicles(self.ax, self.pos, self.ambiente, node_radius)
+        self.drawer.draw_edges(self.ax, self.G, self._node_index, self._xs, self._ys)
+        self.drawer.draw_nodes(self.ax, self.G, self._node_index, self._xs, self._ys, node_radius)
+        self._draw_vehicles()
+
+        self._route_collection = LineCollection(
+            [], colors="green", linewidths=3, alpha=0.6, zorder=1.5)
+        self.ax.add_collection(self._route_collection)
 
         # Handle legacy car_point
-        if self.car_point is None:
-            vx = self.car_info.get("visual_x", 0.0)
-            vy = self.car_info.get("visual_y", 0.0)
-            self.car_point, = self.ax.plot(
-                [vx], [vy], "ro", markersize=max(6, int(node_radius * 40)), zorder=5
-            )
+        vx = self.car_info.get("visual_x", 0.0)
+        vy = self.car_info.get("visual_y", 0.0)
+        self.car_point, = self.ax.plot(
+            [vx], [vy], "ro", markersize=max(6, int(node_radius * 40)), zorder=5
+        )
 
+        self._initialized = True
         self.canvas.draw_idle()
 
     def _animation_step(self, _):
-        """Passo de animação - atualizar se há movimento."""
+        """Passo de animação - move os veículos se há movimento.
+
+        Devolve os artistas animados (redesenhados por blitting); o resto do
+        grafo só é redesenhado em `update_time`.
+        """
         if self.car_info.get("is_moving"):
-            self._update_drawing()
+            self._draw_vehicles()
+            self._update_car_point()
+        return self._animated_artists()
+
+    def _on_full_draw(self, _event):
+        """Atualiza o fundo do blitting depois de um redesenho completo.
+
+        O FuncAnimation só volta a capturar o fundo quando a vista ou o tamanho
+        da janela mudam; sem isto, o frame seguinte repunha o fundo antigo por
+        cima do novo (ex.: a rota destacada ou o título desapareciam). O redesenho
+        completo não pinta os artistas animados, por isso são desenhados já
+        sobre o fundo acabado de capturar.
+        """
+        animation = self.animation
+        animation._blit_cache.clear()
+        if animation._drawn_artists:
+            animation._blit_draw(animation._drawn_artists)
+
+    def _draw_vehicles(self):
+        return self.drawer.draw_vehicles(
+            self.ax, self._node_index, self._xs, self._ys, self.ambiente, self.node_radius)
+
+    def _animated_artists(self):
+        return tuple(a for a in (self.drawer.vehicle_scatter, self.car_point) if a is not None)
+
+    def _update_car_point(self):
+        if self.car_point is not None:
+            vx = self.car_info.get("visual_x", 0.0)
+            vy = self.car_info.get("visual_y", 0.0)
+            self.car_point.set_data([vx], [vy])
 
     def _update_drawing(self):
-        """Atualiza posições mantendo viewport."""
+        """Atualiza os veículos mantendo viewport.
+
+        As posições dos nós e arestas não mudam depois do layout (ver
+        `_draw_complete_graph`). Devolve True se algum veículo mudou.
+        """
         # Guardar viewport antes de atualizar
         self.viewport.save_state(self.ax)
 
-        # Atualizar posições
-        self.drawer.update_positions(self.pos)
-
         # Atualizar veículos (se em movimento)
-        node_radius = self.drawer.compute_node_radius(self.pos)
-        self.drawer.draw_vehicles(self.ax, self.pos, self.ambiente, node_radius)
-
-        # Atualizar título com tempo e viagens
-        tempo_str = self.car_info.get("tempo", "--:--:--")
-        viagens_ativas = len(self.car_info.get("viagens", []))
-        self.ax.set_title(f"Simulação — Tempo {tempo_str} | Viagens ativas: {viagens_ativas}")
+        changed = self._draw_vehicles()
 
         # Update car_point if needed
-        if self.car_point is not None:
-            vx = self.car_info.get("visual_x", 0.0)
-            vy = self.car_info.get("visual_y", 0.0)
-            self.car_point.set_data([vx], [vy])
+        self._update_car_point()
 
         # Restaurar viewport
         self.viewport.restore_state(self.ax)
-        self.canvas.draw_idle()
-        print("[GraphViewer] Atualização concluída.")
+        return changed
 
     # ========== API PÚBLICA (chamada via queue) ==========
 
     def update_time(self, tempo_simulacao, viagens_ativas):
-        """Atualizar tempo e viagens."""
+        """Atualizar tempo e viagens.
+
+        O título só muda aqui: altera o fundo usado pelo blitting, por isso é
+        seguido de um redesenho completo. Se nem o título nem os veículos
+        mudaram desde o último tick, não se redesenha nada.
+        """
         if isinstance(tempo_simulacao, datetime):
             tstr = tempo_simulacao.strftime("%H:%M:%S")
         else:
             tstr = str(tempo_simulacao)
 
-        self.ax.set_title(f"Simulação — Tempo {tstr} | Viagens ativas: {len(viagens_ativas)}")
-        self._update_drawing()
+        title = f"Simulação — Tempo {tstr} | Viagens ativas: {len(viagens_ativas)}"
+        title_changed = title != self._title
+        if title_changed:
+            self._title = title
+            self.ax.set_title(title)
+
+        if self._update_drawing() or title_changed:
+            self._request_redraw()
 
     def highlight_route(self, rota):
-        """Destaca uma rota."""
-        if not rota or len(rota) < 2:
+        """Destaca uma rota (substitui o destaque anterior)."""
+        if not rota or len(rota) < 2 or self._route_collection is None:
             return
 
-        for i in range(len(rota) - 1):
-            u, v = rota[i], rota[i + 1]
-            if u in self.pos and v in self.pos:
-                x1, y1 = self.pos[u]
-                x2, y2 = self.pos[v]
-                self.ax.plot([x1, x2], [y1, y2], color="green", linewidth=3, alpha=0.6, zorder=1.5)
+        pares = [(self._node_index[u], self._node_index[v]) for u, v in zip(rota, rota[1:])
+                 if u in self._node_index and v in self._node_index]
+        u_idx = [u for u, _ in pares]
+        v_idx = [v for _, v in pares]
+        self._route_collection.set_segments(
+            self.drawer.edge_segments(self._xs, self._ys, u_idx, v_idx))
+
+        self._request_redraw()
+
+    def _request_redraw(self):
+        """Agenda um redesenho do canvas, no máximo um por REDRAW_INTERVAL.
+
+        Vários pedidos seguidos (ex.: uma rajada de mensagens da fila) resultam
+        num único `draw_idle`.
+        """
+        if self._redraw_pending:
+            return
+        self._redraw_pending = True
+        espera = self.REDRAW_INTERVAL - (time.monotonic() - self._last_draw)
+        if espera > 0:
+            self.root.after(int(espera * 1000) + 1, self._flush_redraw)
+        else:
+            self.root.after_idle(self._flush_redraw)
 
+    def _flush_redraw(self):
+        self._redraw_pending = False
+        self._last_draw = time.monotonic()
         self.canvas.draw_idle()
 
     def run(self):
@@ -14,6 +14,15 @@ def register_interactions(app):
     app.canvas.mpl_connect("motion_notify_event", lambda e: _on_motion(app, e))
 
 
+def _redraw(app):
+    """Redesenho agrupado (no máximo um por frame) quando o viewer o suporta."""
+    request_redraw = getattr(app, "_request_redraw", None)
+    if request_redraw is not None:
+        request_redraw()
+    else:
+        app.canvas.draw_idle()
+
+
 def _on_button_press(app, event):
     """Iniciou drag - guardar estado antes de começar."""
     if event.inaxes != app.ax:
@@ -44,6 +53,9 @@ def _on_button_release(app, event):
         except Exception as e:
             print(f"[InteractionHandler] Erro ao salvar viewport após pan: {e}")
 
+        # Redesenho completo só no fim do pan
+        app.canvas.draw_idle()
+
 
 def _on_motion(app, event):
     """Arrastar - atualizar limites do eixo em tempo real."""
@@ -65,7 +77,7 @@ def _on_motion(app, event):
         ylim0, ylim1 = app._ylim_start
         app.ax.set_xlim(xlim0 + dx_data, xlim1 + dx_data)
         app.ax.set_ylim(ylim0 + dy_data, ylim1 + dy_data)
-        app.canvas.draw_idle()
+        _redraw(app)
 
 
 def _on_scroll(app, event):
@@ -108,4 +120,4 @@ def _on_scroll(app, event):
     except Exception as e:
         print(f"[InteractionHandler] Erro ao salvar viewport no scroll: {e}")
 
-    app.canvas.draw_idle()
+    _redraw(app)
@@ -1,8 +1,29 @@
 """Algoritmos de layout com melhor espaçamento."""
 
+import hashlib
+import os
+import tempfile
+import zipfile
+
 import networkx as nx
+import numpy as np
 import math
 
+# Diretório onde os layouts calculados ficam guardados entre execuções
+LAYOUT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ia_layout")
+
+
+def compute_coordinate_arrays(pos):
+    """Converte `pos` (nó -> (x, y)) em arrays paralelos de coordenadas.
+
+    Devolve (índice nó -> posição, xs, ys), para calcular limites e raios
+    com operações vetoriais em vez de percorrer o dicionário.
+    """
+    node_index = {n: i for i, n in enumerate(pos)}
+    xs = np.fromiter((p[0] for p in pos.values()), dtype=np.float64, count=len(pos))
+    ys = np.fromiter((p[1] for p in pos.values()), dtype=np.float64, count=len(pos))
+    return node_index, xs, ys
+
 
 def compute_layout_circular(G, scale=1.0):
     """Layout circular - bom para grafo pequeno."""
@@ -26,12 +47,69 @@ def compute_layout_kamada_kawai(G, scale=1.0):
     return pos * (scale * 10.0)
 
 
-def compute_layout_best(G, scale=1.0):
+def _layout_cache_key(G, nome, **params):
+    """Hash da topologia (nós e arestas) e dos parâmetros do layout."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((nome, sorted(params.items()))).encode())
+    for n in sorted(map(str, G.nodes())):
+        h.update(n.encode() + b"\0")
+    for u, v in sorted(tuple(sorted((str(u), str(v)))) for u, v in G.edges()):
+        h.update(f"{u}|{v}".encode() + b"\0")
+    return h.hexdigest()
+
+
+def load_or_compute_layout(G, compute, nome, **params):
+    """Devolve o layout guardado em LAYOUT_CACHE_DIR ou calcula-o e guarda-o.
+
+    Os layouts são determinísticos (seed fixa), por isso o mesmo grafo com os
+    mesmos parâmetros dá sempre o mesmo resultado. Erros de leitura/escrita da
+    cache são ignorados (calcula-se o layout normalmente). A escrita é feita num
+    ficheiro temporário e só depois movida para o lugar final, para que uma
+    escrita interrompida nunca deixe um .npz truncado.
+    """
+    caminho = os.path.join(LAYOUT_CACHE_DIR, _layout_cache_key(G, nome, **params) + ".npz")
+    try:
+        with np.load(caminho, allow_pickle=False) as dados:
+            nomes = dados["nodes"].tolist()
+            xy = dados["xy"].tolist()
+        if set(nomes) == set(map(str, G.nodes())):
+            por_nome = {str(n): n for n in G.nodes()}
+            return {por_nome[nome_no]: tuple(c) for nome_no, c in zip(nomes, xy)}
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        pass
+
+    pos = compute(G, **params)
+    temporario = None
+    try:
+        os.makedirs(LAYOUT_CACHE_DIR, exist_ok=True)
+        nodes = list(pos)
+        fd, temporario = tempfile.mkstemp(dir=LAYOUT_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, nodes=np.array([str(n) for n in nodes]),
+                     xy=np.array([pos[n] for n in nodes], dtype=np.float64).reshape(-1, 2))
+        os.replace(temporario, caminho)
+        temporario = None
+    except (OSError, ValueError):
+        pass
+    finally:
+        if temporario is not None:
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+    return pos
+
+
+def compute_layout_best(G, scale=1.0, use_cache=True):
     """
     Escolhe o melhor layout baseado no tamanho do grafo.
 
     scale: multiplicador de espaçamento (1.0 = normal, 2.0 = 2x mais espaço)
+    use_cache: reutilizar o layout guardado em disco para o mesmo grafo
     """
+    if use_cache:
+        return load_or_compute_layout(G, compute_layout_best, "best", scale=scale, use_cache=False)
+
     n = G.number_of_nodes()
 
     if n < 10:
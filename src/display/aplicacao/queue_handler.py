@@ -2,21 +2,107 @@
 """
 Processes commands from the queue and updates the graph viewer.
 """
+import queue
 
+# Polling interval (ms) while the queue stays empty
+HEARTBEAT_MS = 100
 
-def process_queue(app):
+# Polling interval (ms) right after messages were found; grows back towards
+# HEARTBEAT_MS in POLL_STEP_MS steps while the queue stays empty
+POLL_MIN_MS = 20
+POLL_STEP_MS = 20
+
+# Maximum messages handled per drain, so a backlog cannot starve Tk's redraws
+MAX_BATCH = 64
+
+
+class CoalescingQueue(queue.Queue):
     """
-    Called periodically via Tk's after() to check for messages from the simulator.
+    Queue where state snapshots replace the pending one of the same type.
+
+    Messages whose type is in COALESCED_TYPES (e.g. "update_time") only matter
+    in their latest version: if one is still waiting to be read, a new one
+    overwrites it in place instead of queueing another UI update. Event
+    messages ("new_trip", "reject", "log", ...) are queued as usual.
+    """
+
+    COALESCED_TYPES = frozenset({"update_time", "metrics"})
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self._latest = {}  # type -> latest pending snapshot
+
+    # _put/_get run with the queue mutex held (see queue.Queue)
+    def _put(self, item):
+        msg_type = item.get("type") if isinstance(item, dict) else None
+        if msg_type in self.COALESCED_TYPES:
+            if msg_type in self._latest:
+                # Merged into the pending snapshot: no new item will be read, so
+                # undo the count put() adds next, keeping task_done()/join() exact
+                self.unfinished_tasks -= 1
+            else:
+                self.queue.append(_Snapshot(msg_type))
+            self._latest[msg_type] = item
+        else:
+            self.queue.append(item)
+
+    def _get(self):
+        item = self.queue.popleft()
+        if isinstance(item, _Snapshot):
+            return self._latest.pop(item.msg_type)
+        return item
+
+
+class _Snapshot:
+    """Placeholder in the queue for the latest message of a coalesced type."""
+
+    __slots__ = ("msg_type",)
+
+    def __init__(self, msg_type):
+        self.msg_type = msg_type
+
+
+def drain_queue(app):
     """
+    Handles up to MAX_BATCH queued messages.
+
+    If the batch fills up, the rest is drained in a later Tk callback so that
+    redraws and input events get a turn in between. Returns the number of
+    messages handled.
+    """
+    handled = 0
     try:
-        while not app.command_queue.empty():
-            message = app.command_queue.get_nowait()
+        while handled < MAX_BATCH:
+            try:
+                message = app.command_queue.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
             handle_message(app, message)
     except Exception as e:
         print(f"[queue_handler] Error processing queue: {e}")
 
+    if handled == MAX_BATCH:
+        app.root.after(0, lambda: drain_queue(app))
+    return handled
+
+
+def process_queue(app):
+    """
+    Called periodically via Tk's after() to check for messages from the simulator.
+
+    The interval adapts: POLL_MIN_MS after finding messages, then backs off
+    to HEARTBEAT_MS while the queue stays empty.
+    """
+    interval = getattr(app, "_poll_interval", HEARTBEAT_MS)
+    if drain_queue(app):
+        interval = POLL_MIN_MS
+    else:
+        interval = min(HEARTBEAT_MS, interval + POLL_STEP_MS)
+    app._poll_interval = interval
+
     # Schedule next check
-    app.root.after(100, lambda: process_queue(app))
+    app.root.after(interval, lambda: process_queue(app))
 
 
 def handle_message(app, message):
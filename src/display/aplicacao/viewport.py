@@ -20,7 +20,6 @@ class Viewport:
                 self.zoom_level = (xlim[1] - xlim[0]) * (ylim[1] - ylim[0])
                 # Garantir que não voltamos ao auto-scale
                 self.is_auto_scale = False
-                print(f"[Viewport] Estado guardado: xlim={self.xlim}, ylim={self.ylim}")
         except Exception as e:
             print(f"[Viewport] Erro ao salvar estado: {e}")
 
@@ -32,22 +31,18 @@ class Viewport:
                 ax.set_ylim(self.ylim)
                 # Não reativar auto-scale ao restaurar
                 self.is_auto_scale = False
-                print(f"[Viewport] Estado restaurado: xlim={self.xlim}, ylim={self.ylim}")
             except Exception as e:
                 print(f"[Viewport] Erro ao restaurar estado: {e}")
 
-    def apply_auto_scale(self, ax, pos, margin=0.15):
-        """Auto-escala inicial baseada nos nós."""
+    def apply_auto_scale(self, ax, xs, ys, margin=0.15):
+        """Auto-escala inicial baseada nos nós (xs, ys: arrays de coordenadas)."""
         # Apenas aplicar se é primeira vez (is_auto_scale == True)
-        if not self.is_auto_scale or not pos:
+        if not self.is_auto_scale or not len(xs):
             return
 
-        xs = [p[0] for p in pos.values()]
-        ys = [p[1] for p in pos.values()]
-
-        if xs and ys:
-            minx, maxx = min(xs), max(xs)
-            miny, maxy = min(ys), max(ys)
+        if len(xs) and len(ys):
+            minx, maxx = float(xs.min()), float(xs.max())
+            miny, maxy = float(ys.min()), float(ys.max())
             dx = maxx - minx if maxx != minx else 1.0
             dy = maxy - miny if maxy != miny else 1.0
 
@@ -1,6 +1,5 @@
-import queue
-
 from display.aplicacao.graph_viewer import AnimatedGraphApp
+from display.aplicacao.queue_handler import CoalescingQueue
 from display.aplicacao.dashboard_window import DashboardWindow
 
 
@@ -12,7 +11,8 @@ class DisplayGraficos:
 
     def __init__(self, frequencia_display: float = 10.0):
 
-        self.command_queue = queue.Queue()
+        # Atualizações de estado ainda por ler são substituídas pela mais recente
+        self.command_queue = CoalescingQueue()
         self.frequencia_display = frequencia_display
         self.viewer_app = None
         self.dashboard = None
@@ -4,6 +4,8 @@ from textual.widgets import Header, Footer, Static, DataTable
 from textual.containers import Container, Vertical
 from textual.reactive import reactive
 from datetime import datetime
+from collections import deque
+from itertools import islice
 
 
 class GraphCarController(App):
@@ -66,8 +68,8 @@ class GraphCarController(App):
     def __init__(self, command_queue):
         super().__init__()
         self.command_queue = command_queue
-        self.logs = []
         self.max_logs = 50
+        self.logs = deque(maxlen=self.max_logs)  # descarta os mais antigos
         self.active_trips_data = {}
 
     def compose(self) -> ComposeResult:
@@ -196,10 +198,6 @@ class GraphCarController(App):
 
         self.logs.append(log_entry)
 
-        # Keep only last N logs
-        if len(self.logs) > self.max_logs:
-            self.logs.pop(0)
-
     def update_display(self):
         """Update all display widgets with current data."""
         # Update time display
@@ -229,5 +227,6 @@ class GraphCarController(App):
 
         # Update logs display
         logs_widget = self.query_one("#logs_display", Static)
-        logs_text = "\n".join(self.logs[-15:])  # Show last 15 logs
+        # Show last 15 logs
+        logs_text = "\n".join(islice(self.logs, max(0, len(self.logs) - 15), None))
         logs_widget.update(logs_text)
@@ -14,6 +14,11 @@ class Pedido:
     Representa um pedido de transporte.
     """
 
+    __slots__ = (
+        '_id', '_origem', '_destino', '_numero_passageiros', '_horario_pretendido',
+        '_prioridade', '_preferencia_ambiental', '_ride_sharing', '_estado', '_atribuir_a',
+    )
+
     def __init__(self, pedido_id: int, origem: int, destino: int, passageiros: int,
                  horario_pretendido: datetime, prioridade: int = 0,
                  preferencia_ambiental: int = 0, ride_sharing: bool = False):
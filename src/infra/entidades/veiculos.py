@@ -15,6 +15,16 @@ class EstadoVeiculo(Enum):
 
 
 class Veiculo(ABC):
+    # Atributos fixos: acesso mais rápido e menos memória por veículo
+    __slots__ = (
+        '_id_veiculo', '_autonomia_maxima', '_autonomia_atual',
+        '_capacidade_passageiros', '_numero_passageiros', '_custo_operacional_km',
+        '_estado', '_localizacao_atual', 'viagens', 'viagem_recarga',
+        'viagem_reposicionamento', '_autonomia_critica_percentual',
+        '_tempo_recarga_inicio', '_localizacao_abastecimento',
+        'plano_recarga_pendente', '_rota_ate_cliente', '_distancia_ate_cliente',
+    )
+
     def __init__(self, id_veiculo: int, autonomia_maxima: int, autonomia_atual: int,
                  capacidade_passageiros: int, numero_passageiros: int, custo_operacional_km: float,
                  estado: EstadoVeiculo = EstadoVeiculo.DISPONIVEL, localizacao_atual=0,
@@ -231,6 +241,20 @@ class Veiculo(ABC):
         """Define a localização atual (pode ser nome do nó ou ID)."""
         self._localizacao_atual = value
 
+    @property
+    def localizacao_atual_nome(self) -> Optional[str]:
+        """Nome do nó onde o veículo está, ou None se a localização for um ID.
+
+        O `GestaoAmbiente` guarda já o nome do nó ao carregar os veículos (e as
+        viagens usam sempre nomes), por isso no caminho normal é uma string. Só
+        é None para veículos criados com um ID numérico fora desse carregamento
+        (ou carregados antes do grafo): o veículo não conhece o grafo, e quem
+        precisa do nome resolve o ID com `grafo.getNodeName` (ver
+        `AlocadorBase._nome_localizacao`).
+        """
+        localizacao = self._localizacao_atual
+        return localizacao if type(localizacao) is str else None
+
     @property
     def viagem_ativa(self):
         """Indica se há alguma viagem ativa neste veículo (pedidos, recarga ou reposicionamento)."""
@@ -539,6 +563,8 @@ class Veiculo(ABC):
 
 
 class VeiculoCombustao(Veiculo):
+    __slots__ = ()
+
     def __init__(self, id_veiculo, autonomia_maxima, autonomia_atual, capacidade_passageiros,
                  # meter custo litro por kilometro se for preciso
                  custo_operacional_km, numero_passageiros=0, localizacao_atual=0):
@@ -567,6 +593,8 @@ class VeiculoCombustao(Veiculo):
 # -------------------- Veículo Elétrico ---------------- #
 
 class VeiculoEletrico(Veiculo):
+    __slots__ = ('_tempo_recarga_km',)
+
     def __init__(
             self,
             id_veiculo,
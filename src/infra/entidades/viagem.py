@@ -23,9 +23,7 @@ class ViagemBase:
             velocidade_media: float = 50.0) -> List[dict]:
         """Calcula informações dos segmentos para uma rota."""
         segmentos = []
-        for i in range(len(rota) - 1):
-            origem = rota[i]
-            destino = rota[i + 1]
+        for origem, destino in zip(rota, rota[1:]):
             aresta = grafo.getEdge(origem, destino)
 
             if not aresta:
@@ -149,8 +147,8 @@ class ViagemReposicionamento(ViagemBase):
         if len(rota_restante) < 2:
             return False
 
-        for i in range(len(rota_restante) - 1):
-            aresta = grafo.getEdge(rota_restante[i], rota_restante[i + 1])
+        for a, b in zip(rota_restante, rota_restante[1:]):
+            aresta = grafo.getEdge(a, b)
             if aresta and aresta.getNome() == nome_aresta:
                 return True
         return False
@@ -229,8 +227,16 @@ class Viagem(ViagemBase):
         """
         if not isinstance(local, str) or not local:
             return False
-        restante = self.rota_restante()
-        return local in restante
+        rota = self.rota
+        if not rota:
+            return False
+        idx = max(0, min(self.indice_segmento_atual, len(rota) - 1))
+        # Procurar a partir do índice atual sem copiar a rota restante
+        try:
+            rota.index(local, idx)
+        except ValueError:
+            return False
+        return True
 
     def rota_restante(self) -> List[str]:
         """Retorna a rota restante (do segmento atual até ao fim)."""
@@ -255,8 +261,8 @@ class Viagem(ViagemBase):
         if len(rota) < 2:
             return False
 
-        for i in range(len(rota) - 1):
-            aresta = grafo.getEdge(rota[i], rota[i + 1])
+        for a, b in zip(rota, rota[1:]):
+            aresta = grafo.getEdge(a, b)
             if aresta and aresta.getNome() == nome_aresta:
                 return True
         return False
@@ -4,7 +4,8 @@ Contém o grafo da cidade, frota de veículos e pedidos.
 """
 
 import json
-from typing import Dict, List, Optional
+import sys
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
 from infra.grafo.grafo import Grafo
@@ -13,6 +14,14 @@ from infra.entidades.pedidos import Pedido, EstadoPedido
 from infra.entidades.viagem import Viagem
 
 
+def _internar_nome(local):
+    """Interna nomes de nós lidos do JSON (os IDs inteiros ficam como estão).
+
+    Assim as localizações partilham o objeto string com o nó do grafo (ver `Node`).
+    """
+    return sys.intern(local) if isinstance(local, str) else local
+
+
 class GestaoAmbiente:
     """
     Classe que representa o ambiente completo da simulação:
@@ -47,8 +56,11 @@ class GestaoAmbiente:
 
             # Localização inicial (pode ser nome do nó ou ID)
             localizacao_inicial = v_data.get('localizacao_atual', 0)
-            # Se for string (nome do nó), manter como string
-            # O código será atualizado para aceitar ambos
+            # Se for ID e o grafo já estiver carregado, guardar o nome do nó
+            if self.grafo is not None and not isinstance(localizacao_inicial, str):
+                localizacao_inicial = (self.grafo.getNodeName(localizacao_inicial)
+                                       or localizacao_inicial)
+            localizacao_inicial = _internar_nome(localizacao_inicial)
 
             if tipo == 'combustao':
                 veiculo = VeiculoCombustao(
@@ -93,8 +105,8 @@ class GestaoAmbiente:
 
             pedido = Pedido(
                 pedido_id=p_data['pedido_id'],
-                origem=p_data['origem'],
-                destino=p_data['destino'],
+                origem=_internar_nome(p_data['origem']),
+                destino=_internar_nome(p_data['destino']),
                 passageiros=p_data['passageiros'],
                 horario_pretendido=horario,
                 prioridade=p_data.get('prioridade', 1),
@@ -120,6 +132,10 @@ class GestaoAmbiente:
         """Retorna lista de todos os veículos."""
         return list(self._veiculos.values())
 
+    def iter_veiculos(self) -> Iterator[Veiculo]:
+        """Itera sobre os veículos sem copiar a frota (não alterar durante a iteração)."""
+        return iter(self._veiculos.values())
+
     def listar_veiculos_disponiveis(self) -> List[Veiculo]:
         """Retorna apenas veículos disponíveis."""
         return [v for v in self._veiculos.values()
@@ -157,6 +173,10 @@ class GestaoAmbiente:
         """Retorna lista de todos os pedidos."""
         return list(self._pedidos.values())
 
+    def iter_pedidos(self) -> Iterator[Pedido]:
+        """Itera sobre os pedidos sem copiar a lista (não alterar durante a iteração)."""
+        return iter(self._pedidos.values())
+
     def listar_pedidos_pendentes(self) -> List[Pedido]:
         """Retorna apenas pedidos pendentes."""
         return [p for p in self._pedidos.values()
@@ -244,7 +264,7 @@ class GestaoAmbiente:
         inicio = self.grafo.getRandomNodo()
         inicio_nome = inicio.getName()
 
-        vizinhos = [v for (v, _) in self.grafo.getNeighbours(inicio_nome)]
+        vizinhos = {adj[0] for adj in self.grafo.getNeighbours(inicio_nome)}
 
         fim = self.grafo.getRandomNodo()
         while fim.getName() in vizinhos:
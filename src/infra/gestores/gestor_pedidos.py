@@ -152,7 +152,8 @@ class GestorPedidos:
         """
         origem_nome, destino_nome = self.ambiente.obter_nomes_nos_pedido(pedido)
 
-        rota_viagem = self.navegador.calcular_rota(
+        # A distância vem memorizada junto com a rota (cache do navegador)
+        rota_viagem, distancia_viagem = self.navegador.calcular_rota_em_cache(
             self.ambiente.grafo, origem_nome, destino_nome
         )
 
@@ -169,7 +170,6 @@ class GestorPedidos:
                 self.display.registrar_rejeicao()
             return (None, 0, origem_nome, destino_nome)
 
-        distancia_viagem = self.ambiente.grafo.calcular_distancia_rota(rota_viagem)
         return (rota_viagem, distancia_viagem, origem_nome, destino_nome)
 
     def _escolher_veiculo_para_pedido(self, pedido, rota_viagem, distancia_viagem):
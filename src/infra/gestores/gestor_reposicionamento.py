@@ -123,8 +123,9 @@ class GestorReposicionamento:
             if origem == destino:
                 return False
 
-            # Calcular rota
-            rota = self.navegador.calcular_rota(self.ambiente.grafo, origem, destino)
+            # Calcular rota (e distância, memorizada pelo navegador)
+            rota, distancia = self.navegador.calcular_rota_em_cache(
+                self.ambiente.grafo, origem, destino)
             if not rota:
                 self.logger.log(
                     f"  {horario_log} - [yellow] Reposicionamento V{veiculo.id_veiculo}: "
@@ -132,9 +133,6 @@ class GestorReposicionamento:
                 )
                 return False
 
-            # Calcular distância usando o grafo
-            distancia = self.ambiente.grafo.calcular_distancia_rota(rota)
-
             # Verificar autonomia
             if veiculo.autonomia_atual < distancia:
                 self.logger.log(
@@ -12,6 +12,11 @@ class NivelTransito(Enum):
 class Aresta:
     def __init__(self, quilometro: int, velocidadeMaxima: float, nome: str, transito: NivelTransito = NivelTransito.NORMAL):  # construtor do nodo....."
         self.m_quilometro = quilometro
+        # Distância já convertida para float, lida diretamente pelas funções de custo
+        self.km = float(quilometro)
+        # Tempo (horas) sem trânsito, calculado uma única vez. Com velocidade 0 fica
+        # None e a divisão (e o seu erro) só acontece em getTempoPercorrer, como antes
+        self.tempo_base = self.km / velocidadeMaxima if velocidadeMaxima else None
         self.m_velocidadeMaxima = velocidadeMaxima
         self.m_nivelTransito = transito
         self.m_nome = nome
@@ -41,7 +46,9 @@ class Aresta:
         if (self.m_nivelTransito == NivelTransito.ACIDENTE):
             return None
         else:
-            return (self.m_quilometro / self.m_velocidadeMaxima) * self.m_nivelTransito.value
+            if self.tempo_base is None:
+                return (self.m_quilometro / self.m_velocidadeMaxima) * self.m_nivelTransito.value
+            return self.tempo_base * self.m_nivelTransito.value
 
     def __eq__(self, other):
         # ver se é preciso tb testar o id....
@@ -3,6 +3,7 @@ import math
 import random
 from .node import Node, TipoNodo
 from .aresta import Aresta, NivelTransito
+from .grafo_csr import GrafoCSR
 
 
 class Grafo:
@@ -10,6 +11,12 @@ class Grafo:
         self.m_nodes = []
         self.m_directed = directed
         self.m_graph = {}  # { node_name: [(dest_name, Aresta), ...] }
+        # { (orig_name, dest_name): Aresta } com a primeira aresta de cada par (ver getEdge)
+        self._arestas_por_par = {}
+        self._csr = None  # GrafoCSR construído a pedido (invalidado ao adicionar arestas)
+        self._predecessores = None  # { node_name: [(orig_name, Aresta), ...] } em grafos dirigidos
+        # Incrementado sempre que a estrutura ou o trânsito mudam (invalida caches de rotas)
+        self.versao = 0
 
     def __str__(self):
         out = ""
@@ -65,8 +72,43 @@ class Grafo:
             self.m_graph[n2_name] = []
 
         self.m_graph[n1_name].append((n2_name, aresta))
+        self._arestas_por_par.setdefault((n1_name, n2_name), aresta)
         if not self.m_directed:
             self.m_graph[n2_name].append((n1_name, aresta))
+            self._arestas_por_par.setdefault((n2_name, n1_name), aresta)
+
+        self._csr = None
+        self._predecessores = None
+        self.versao += 1
+
+    ##############################
+    #   representação CSR
+    ##############################
+    def get_csr(self) -> GrafoCSR:
+        """Devolve as adjacências em formato CSR, construídas uma única vez.
+
+        A estrutura é reconstruída automaticamente depois de `add_edge`.
+        """
+        if self._csr is None:
+            self._csr = GrafoCSR(self)
+        return self._csr
+
+    def get_predecessores(self):
+        """Mapa nó -> lista de tuplos (nome_nodo, aresta) que apontam para esse nó.
+
+        Em grafos não dirigidos são as próprias adjacências. Em grafos dirigidos é
+        construído uma única vez e reconstruído depois de `add_edge`. A estrutura
+        é partilhada e não deve ser alterada.
+        """
+        if not self.m_directed:
+            return self.m_graph
+        if self._predecessores is None:
+            preds = {}
+            for n, adj in self.m_graph.items():
+                for (dest, aresta) in adj:
+                    preds.setdefault(dest, []).append((n, aresta))
+            self._predecessores = preds
+        return self._predecessores
 
     #############################
     # devolver nodos
@@ -115,8 +157,8 @@ class Grafo:
     ##############################
     def calcula_custo(self, caminho):
         custo = 0
-        for i in range(len(caminho) - 1):
-            custo += self.get_arc_cost(caminho[i], caminho[i + 1])
+        for a, b in zip(caminho, caminho[1:]):
+            custo += self.get_arc_cost(a, b)
         return custo
 
     ####################
@@ -124,15 +166,18 @@ class Grafo:
     ##############################
 
     def getNeighbours(self, nodo):
-        lista = []
-        for (adjacente, peso) in self.m_graph[nodo]:
-            lista.append((adjacente, peso))
-        return lista
+        """Lista de tuplos (nome_vizinho, aresta) do nodo.
+
+        Devolve a própria lista de adjacências (sem cópia): não deve ser alterada.
+        """
+        return self.m_graph[nodo]
 
     def getNodeName(self, node_id_or_name):
         """
         Retorna o nome de um nodo dado o seu ID ou, se já for um nome, devolve-o.
         Se não encontrar, devolve None.
+
+        Os nomes obtidos a partir do ID são as strings internadas dos nós (ver `Node`).
         """
         # Se já for string, assumir que é o nome e devolver tal como está
         if isinstance(node_id_or_name, str):
@@ -151,13 +196,11 @@ class Grafo:
     def getEdge(self, from_node: str, to_node: str):
         """
         Devolve o objeto Aresta entre dois nós (nomes). Se não existir, devolve None.
+
+        Havendo arestas paralelas, devolve a primeira que foi adicionada. A
+        consulta é feita num índice por par de nós, sem percorrer as adjacências.
         """
-        if from_node not in self.m_graph:
-            return None
-        for (dest, aresta) in self.m_graph[from_node]:
-            if dest == to_node:
-                return aresta
-        return None
+        return self._arestas_por_par.get((from_node, to_node))
 
         # nao seria mais facil guardar as arestas num dict com chave o nome da
         # aresta? em vez de percorrer o grafo todo para encontrar a aresta pelo
@@ -186,9 +229,14 @@ class Grafo:
         if rota is None or len(rota) < 2:
             return 0.0
 
+        distancia_total = self.get_csr().quilometros_rota(rota)
+        if distancia_total is not None:
+            return distancia_total
+
+        # Rota com nós que não existem no grafo: somar apenas as arestas existentes
         distancia_total = 0.0
-        for i in range(len(rota) - 1):
-            aresta = self.getEdge(rota[i], rota[i + 1])
+        for a, b in zip(rota, rota[1:]):
+            aresta = self.getEdge(a, b)
             if aresta:
                 distancia_total += aresta.getQuilometro()
 
@@ -204,8 +252,8 @@ class Grafo:
             return 0.0
 
         tempo_total_horas = 0.0
-        for i in range(len(rota) - 1):
-            aresta = self.getEdge(rota[i], rota[i + 1])
+        for a, b in zip(rota, rota[1:]):
+            aresta = self.getEdge(a, b)
             if aresta:
                 tempo_segmento = aresta.getTempoPercorrer()
                 if tempo_segmento is None:
@@ -287,6 +335,7 @@ class Grafo:
         aresta = self.getEdgeByName(nome_aresta)
         if aresta:
             aresta.setNivelTransito(nivel)
+            self.versao += 1
             return True
         return False
 
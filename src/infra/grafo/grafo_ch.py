@@ -0,0 +1,238 @@
+"""Contraction Hierarchies (CH) sobre a representação CSR do grafo.
+
+O pré-processamento contrai os nós por ordem de importância e acrescenta atalhos
+("shortcuts") que preservam as distâncias mínimas. Cada consulta passa a ser uma
+procura de Dijkstra bidirecional que só sobe na hierarquia, visitando uma fração
+pequena do grafo.
+"""
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .grafo_csr import GrafoCSR
+
+# Limite de nós fixados em cada procura de testemunhas. Uma procura incompleta
+# só acrescenta atalhos a mais, nunca torna as distâncias incorretas.
+LIMITE_TESTEMUNHAS = 64
+
+# Aresta da hierarquia: (peso, nó intermédio do atalho ou -1 se for aresta original)
+_ArestaCH = Tuple[float, int]
+
+
+class IndiceCH:
+    """Hierarquia de contração pronta a responder a consultas de caminho mínimo.
+
+    `cima_frente[u]` guarda as arestas u -> v com v mais importante do que u e
+    `cima_tras[v]` as arestas u -> v com u mais importante do que v (percorridas
+    ao contrário pela procura a partir do destino).
+    """
+
+    def __init__(self, n: int, ordem: List[int], arestas: Dict[Tuple[int, int], _ArestaCH]):
+        self.n = n
+        self.ordem = ordem  # ordem[u] = posição de u na contração
+        self.arestas = arestas
+
+        self.cima_frente: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        self.cima_tras: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        for (u, v), (peso, _) in arestas.items():
+            if ordem[v] > ordem[u]:
+                self.cima_frente[u].append((v, peso))
+            else:
+                self.cima_tras[v].append((u, peso))
+
+    def caminho(self, origem: int, destino: int) -> Optional[List[int]]:
+        """Caminho de custo mínimo (índices do CSR), ou None se não existir."""
+        if origem == destino:
+            return [origem]
+
+        dist_frente = {origem: 0.0}
+        dist_tras = {destino: 0.0}
+        pais_frente = {origem: origem}
+        pais_tras = {destino: destino}
+        fila_frente = [(0.0, origem)]
+        fila_tras = [(0.0, destino)]
+
+        melhor = math.inf
+        encontro = -1
+
+        while fila_frente or fila_tras:
+            # Cada sentido pára quando já não pode melhorar o melhor encontro
+            if fila_frente and fila_frente[0][0] >= melhor:
+                fila_frente = []
+            if fila_tras and fila_tras[0][0] >= melhor:
+                fila_tras = []
+            if not fila_frente and not fila_tras:
+                break
+
+            if fila_frente and (not fila_tras or fila_frente[0][0] <= fila_tras[0][0]):
+                fila, dist, pais, outro, adjacencias = (
+                    fila_frente, dist_frente, pais_frente, dist_tras, self.cima_frente)
+            else:
+                fila, dist, pais, outro, adjacencias = (
+                    fila_tras, dist_tras, pais_tras, dist_frente, self.cima_tras)
+
+            d, u = heapq.heappop(fila)
+            if d > dist[u]:
+                continue
+
+            if u in outro and d + outro[u] < melhor:
+                melhor = d + outro[u]
+                encontro = u
+
+            for (v, peso) in adjacencias[u]:
+                nd = d + peso
+                if nd < dist.get(v, math.inf):
+                    dist[v] = nd
+                    pais[v] = u
+                    heapq.heappush(fila, (nd, v))
+
+        if encontro == -1:
+            return None
+
+        # Arestas da hierarquia (podem ser atalhos) de origem a destino
+        nos = [encontro]
+        no = encontro
+        while pais_frente[no] != no:
+            no = pais_frente[no]
+            nos.append(no)
+        nos.reverse()
+        no = encontro
+        while pais_tras[no] != no:
+            no = pais_tras[no]
+            nos.append(no)
+
+        return self._expandir(nos)
+
+    def _expandir(self, nos: List[int]) -> List[int]:
+        """Substitui cada atalho pelos nós que ele representa."""
+        caminho = [nos[0]]
+        for i in range(len(nos) - 1):
+            pilha = [(nos[i], nos[i + 1])]
+            while pilha:
+                u, v = pilha.pop()
+                meio = self.arestas[(u, v)][1]
+                if meio == -1:
+                    caminho.append(v)
+                else:
+                    # Processar u -> meio antes de meio -> v
+                    pilha.append((meio, v))
+                    pilha.append((u, meio))
+        return caminho
+
+
+def construir_ch(csr: GrafoCSR, peso: Callable[[object], float]) -> IndiceCH:
+    """Constrói a hierarquia de contração para o grafo em `csr`.
+
+    Args:
+        csr: Representação CSR do grafo
+        peso: Função que dá o custo de uma Aresta (arestas com custo infinito
+            são tratadas como inexistentes)
+
+    Returns:
+        IndiceCH pronto a responder a consultas
+    """
+    n = len(csr)
+
+    # Grafo de trabalho (só nós ainda não contraídos) e todas as arestas finais
+    saida: List[Dict[int, float]] = [{} for _ in range(n)]
+    entrada: List[Dict[int, float]] = [{} for _ in range(n)]
+    arestas: Dict[Tuple[int, int], _ArestaCH] = {}
+
+    for u in range(n):
+        for k in range(csr.indptr[u], csr.indptr[u + 1]):
+            v = csr.indices[k]
+            w = peso(csr.arestas[k])
+            if v == u or w == math.inf:
+                continue
+            if w < saida[u].get(v, math.inf):
+                saida[u][v] = w
+                entrada[v][u] = w
+                arestas[(u, v)] = (w, -1)
+
+    contraido = [False] * n
+    vizinhos_contraidos = [0] * n
+    ordem = [0] * n
+
+    def atalhos_necessarios(x: int) -> List[Tuple[int, int, float]]:
+        atalhos = []
+        for u, w_ux in entrada[x].items():
+            alvos = {v: w_ux + w_xv for v, w_xv in saida[x].items() if v != u}
+            if not alvos:
+                continue
+            dist = _procura_testemunhas(saida, u, x, alvos)
+            for v, custo in alvos.items():
+                if dist.get(v, math.inf) > custo:
+                    atalhos.append((u, v, custo))
+        return atalhos
+
+    def prioridade(x: int) -> int:
+        # Diferença de arestas + vizinhos já contraídos (espalha a contração)
+        removidas = len(entrada[x]) + len(saida[x])
+        return len(atalhos_necessarios(x)) - removidas + vizinhos_contraidos[x]
+
+    fila = [(prioridade(x), x) for x in range(n)]
+    heapq.heapify(fila)
+    posicao = 0
+
+    while fila:
+        _, x = heapq.heappop(fila)
+        if contraido[x]:
+            continue
+
+        # Atualização preguiçosa: se a prioridade piorou, voltar a pôr na fila
+        p = prioridade(x)
+        if fila and p > fila[0][0]:
+            heapq.heappush(fila, (p, x))
+            continue
+
+        for (u, v, custo) in atalhos_necessarios(x):
+            if custo < saida[u].get(v, math.inf):
+                saida[u][v] = custo
+                entrada[v][u] = custo
+                arestas[(u, v)] = (custo, x)
+
+        for u in entrada[x]:
+            del saida[u][x]
+            vizinhos_contraidos[u] += 1
+        for v in saida[x]:
+            del entrada[v][x]
+            vizinhos_contraidos[v] += 1
+        entrada[x] = {}
+        saida[x] = {}
+
+        contraido[x] = True
+        ordem[x] = posicao
+        posicao += 1
+
+    return IndiceCH(n, ordem, arestas)
+
+
+def _procura_testemunhas(saida: List[Dict[int, float]], origem: int, ignorar: int,
+                         alvos: Dict[int, float]) -> Dict[int, float]:
+    """Dijkstra local a partir de `origem` que evita o nó `ignorar`.
+
+    Pára quando já não pode encontrar caminhos mais baratos do que os de `alvos`
+    ou ao fim de LIMITE_TESTEMUNHAS nós fixados.
+    """
+    limite = max(alvos.values())
+    dist = {origem: 0.0}
+    fila = [(0.0, origem)]
+    fixados = 0
+
+    while fila and fixados < LIMITE_TESTEMUNHAS:
+        d, u = heapq.heappop(fila)
+        if d > dist[u]:
+            continue
+        if d > limite:
+            break
+        fixados += 1
+
+        for v, w in saida[u].items():
+            if v == ignorar:
+                continue
+            nd = d + w
+            if nd < dist.get(v, math.inf):
+                dist[v] = nd
+                heapq.heappush(fila, (nd, v))
+
+    return dist
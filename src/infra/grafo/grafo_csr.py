@@ -0,0 +1,380 @@
+"""Representação compacta (CSR) das adjacências do grafo, indexada por inteiros.
+
+Os algoritmos de procura que percorrem o grafo muitas vezes por pedido evitam
+assim os acessos a dicionários por nome e as comparações entre nomes de nós.
+"""
+import heapq
+import itertools
+import math
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+class GrafoCSR:
+    """Adjacências do grafo em formato CSR (Compressed Sparse Row).
+
+    Os vizinhos do nó de índice `i` são `indices[indptr[i]:indptr[i + 1]]`, pela
+    mesma ordem de `Grafo.getNeighbours`; `arestas` guarda, na mesma posição, a
+    referência para o objeto Aresta (o trânsito é lido sempre em tempo real).
+
+    `coords_x`/`coords_y` guardam as coordenadas de cada nó (NaN se não tiver).
+
+    `indptr_inv`/`indices_inv` guardam as adjacências invertidas
+    (predecessores de cada nó). Em grafos não dirigidos são as mesmas listas.
+    """
+
+    def __init__(self, grafo):
+        self.idx_to_name: List[str] = list(grafo.m_graph.keys())
+        self.name_to_idx: Dict[str, int] = {
+            nome: i for i, nome in enumerate(self.idx_to_name)}
+
+        self.indptr: List[int] = [0]
+        self.indices: List[int] = []
+        self.arestas: List[object] = []
+
+        for nome in self.idx_to_name:
+            for (destino, aresta) in grafo.m_graph[nome]:
+                self.indices.append(self.name_to_idx[destino])
+                self.arestas.append(aresta)
+            self.indptr.append(len(self.indices))
+
+        # Coordenadas dos nós em arrays contíguos (SoA), NaN quando desconhecidas
+        n = len(self.idx_to_name)
+        self.coords_x = np.full(n, np.nan)
+        self.coords_y = np.full(n, np.nan)
+        for node in grafo.m_nodes:
+            i = self.name_to_idx.get(node.getName())
+            if i is not None and node.getX() is not None and node.getY() is not None:
+                self.coords_x[i] = node.getX()
+                self.coords_y[i] = node.getY()
+
+        # (u, v) -> posição da aresta u -> v em `arestas` e km de cada aresta,
+        # construídos na primeira consulta de custo de uma rota
+        self._posicao_pares: Optional[Dict[Tuple[int, int], int]] = None
+        self._km: Optional[np.ndarray] = None
+
+        # funcao_custo -> [versao do grafo, custos em lista, custos em array ou None]
+        self._pesos: Dict[object, list] = {}
+
+        if grafo.m_directed:
+            self._construir_inversa()
+        else:
+            self.indptr_inv = self.indptr
+            self.indices_inv = self.indices
+
+    def _construir_inversa(self):
+        """Constrói as adjacências invertidas (u -> v passa a v -> u)."""
+        n = len(self.idx_to_name)
+        predecessores = [[] for _ in range(n)]
+        for u in range(n):
+            for k in range(self.indptr[u], self.indptr[u + 1]):
+                predecessores[self.indices[k]].append(u)
+
+        self.indptr_inv = [0]
+        self.indices_inv = []
+        for lista in predecessores:
+            self.indices_inv.extend(lista)
+            self.indptr_inv.append(len(self.indices_inv))
+
+    def arestas_rota(self, rota: Sequence[str]) -> Optional[np.ndarray]:
+        """Posições (em `arestas`) das arestas entre nós consecutivos da rota.
+
+        Pares sem aresta ficam com -1 e, havendo arestas paralelas, usa-se a
+        primeira (como `Grafo.getEdge`).
+
+        Returns:
+            Array de posições, ou None se algum nó da rota não pertencer ao grafo
+        """
+        if self._posicao_pares is None:
+            self._posicao_pares = {}
+            for u in range(len(self.idx_to_name)):
+                for k in range(self.indptr[u], self.indptr[u + 1]):
+                    self._posicao_pares.setdefault((u, self.indices[k]), k)
+
+        name_to_idx = self.name_to_idx
+        ids = [name_to_idx.get(nome) for nome in rota]
+        if None in ids:
+            return None
+
+        posicoes = self._posicao_pares
+        return np.fromiter((posicoes.get(par, -1) for par in zip(ids, ids[1:])),
+                           dtype=np.intp, count=max(len(ids) - 1, 0))
+
+    def somar_rota(self, custos: np.ndarray, rota: Sequence[str]) -> Optional[float]:
+        """Soma, de uma só vez, `custos[k]` das arestas da rota (pares sem aresta contam 0).
+
+        Args:
+            custos: Custo de cada aresta, pela ordem de `arestas`
+
+        Returns:
+            O custo total, ou None se algum nó da rota não pertencer ao grafo
+        """
+        if len(rota) < 2:
+            return 0.0
+        posicoes = self.arestas_rota(rota)
+        if posicoes is None:
+            return None
+        return float(custos.take(posicoes[posicoes >= 0]).sum())
+
+    def quilometros(self) -> np.ndarray:
+        """Distância (km) de cada aresta, pela ordem de `arestas`."""
+        if self._km is None:
+            self._km = np.fromiter((a.km for a in self.arestas), dtype=float,
+                                   count=len(self.arestas))
+        return self._km
+
+    def quilometros_rota(self, rota: Sequence[str]) -> Optional[float]:
+        """Distância total (km) de uma rota em nomes de nós (ver `somar_rota`)."""
+        return self.somar_rota(self.quilometros(), rota)
+
+    def pesos(self, funcao_custo, versao: int) -> List[float]:
+        """Custo (sem veículo) de cada aresta para `funcao_custo`, pela ordem de `arestas`.
+
+        O resultado fica guardado no próprio CSR, por função de custo, e é
+        recalculado quando muda a versão do grafo (ex.: trânsito). A lista é
+        partilhada entre chamadas e não deve ser modificada.
+        """
+        return self._entrada_pesos(funcao_custo, versao)[1]
+
+    def pesos_array(self, funcao_custo, versao: int) -> np.ndarray:
+        """Como `pesos`, mas num array (para somas vetoriais com `somar_rota`)."""
+        entrada = self._entrada_pesos(funcao_custo, versao)
+        if entrada[2] is None:
+            entrada[2] = np.array(entrada[1], dtype=float)
+        return entrada[2]
+
+    def _entrada_pesos(self, funcao_custo, versao: int) -> list:
+        entrada = self._pesos.get(funcao_custo)
+        if entrada is None or entrada[0] != versao:
+            custo_aresta = funcao_custo.custo_aresta
+            entrada = [versao, [custo_aresta(a, None) for a in self.arestas], None]
+            self._pesos[funcao_custo] = entrada
+        return entrada
+
+    def __len__(self):
+        return len(self.idx_to_name)
+
+    def indice(self, nome: str) -> Optional[int]:
+        """Devolve o índice inteiro de um nó, ou None se não existir."""
+        return self.name_to_idx.get(nome)
+
+    def caminho(self, pais: List[int], destino: int) -> List[str]:
+        """Reconstrói o caminho (em nomes) a partir de um vetor de predecessores.
+
+        A origem é o nó cujo predecessor é ele próprio.
+        """
+        caminho = [destino]
+        no = destino
+        while pais[no] != no:
+            no = pais[no]
+            caminho.append(no)
+        caminho.reverse()
+        return [self.idx_to_name[i] for i in caminho]
+
+    def caminho_ate_raiz(self, pais: List[int], inicio: int) -> List[str]:
+        """Caminho (em nomes) de `inicio` até à raiz de uma árvore de predecessores.
+
+        Útil para procuras invertidas: partindo do destino sobre as adjacências
+        invertidas, seguir os predecessores dá a rota na ordem de viagem.
+        """
+        caminho = [inicio]
+        no = inicio
+        while pais[no] != no:
+            no = pais[no]
+            caminho.append(no)
+        return [self.idx_to_name[i] for i in caminho]
+
+
+def bfs_csr_inversa(csr: GrafoCSR, raiz: int, alvos: Set[int]) -> List[int]:
+    """BFS a partir de `raiz` sobre as adjacências invertidas.
+
+    Cobre de uma só vez todos os `alvos` (origens que querem chegar à raiz):
+    o caminho de cada alvo obtém-se com `csr.caminho_ate_raiz(pais, alvo)`.
+    A procura pára quando todos os alvos foram alcançados.
+    """
+    return _bfs(csr.indptr_inv, csr.indices_inv, len(csr), raiz, set(alvos))
+
+
+def _bfs(indptr: List[int], indices: List[int], n: int, raiz: int,
+         alvos: Set[int]) -> List[int]:
+    pais = [-1] * n
+    pais[raiz] = raiz
+    alvos.discard(raiz)
+    if not alvos:
+        return pais
+
+    fila = deque([raiz])
+    while fila:
+        u = fila.popleft()
+        for w in indices[indptr[u]:indptr[u + 1]]:
+            if pais[w] != -1:
+                continue
+            pais[w] = u
+            if w in alvos:
+                alvos.discard(w)
+                if not alvos:
+                    return pais
+            fila.append(w)
+
+    return pais
+
+
+def custo_minimo_csr(csr: GrafoCSR, pesos: List[float], origem: int, destino: int,
+                     h: Optional[Callable[[int], float]] = None) -> Optional[List[int]]:
+    """Custo Uniforme (Dijkstra) sobre o CSR, ou A* quando é dada a heurística `h`.
+
+    Todo o ciclo de relaxação trabalha sobre índices inteiros e listas planas:
+    `pesos[k]` é o custo da aresta `csr.arestas[k]` (infinito = intransitável).
+    A fila guarda (f, -g, ordem de inserção, nó): em empate de f prefere-se o
+    nó mais profundo (maior g), o que evita reexpansões em patamares perto do
+    destino. As entradas obsoletas são descartadas quando saem da fila.
+
+    Returns:
+        Lista de índices de `origem` até `destino`, ou None se não houver caminho
+    """
+    indptr, indices = csr.indptr, csr.indices
+    g = [math.inf] * len(csr)
+    pais = [-1] * len(csr)
+    g[origem] = 0.0
+    pais[origem] = origem
+
+    contador = itertools.count()
+    heappush, heappop = heapq.heappush, heapq.heappop
+    fila = [(h(origem) if h else 0.0, -0.0, next(contador), origem)]
+
+    while fila:
+        _, menos_g, _, u = heappop(fila)
+        g_u = -menos_g
+        if g_u != g[u]:
+            continue
+        if u == destino:
+            caminho = [u]
+            while pais[u] != u:
+                u = pais[u]
+                caminho.append(u)
+            caminho.reverse()
+            return caminho
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            g_v = g_u + pesos[k]
+            if g_v < g[v]:
+                g[v] = g_v
+                pais[v] = u
+                heappush(fila, (g_v + h(v) if h else g_v, -g_v, next(contador), v))
+
+    return None
+
+
+class MemoriaBFS:
+    """Vetores de trabalho da BFS bidirecional, reutilizados entre procuras.
+
+    Em vez de alocar quatro listas de tamanho `n` por consulta, só as posições
+    efetivamente visitadas são repostas a -1 no fim de cada procura.
+    Não é thread-safe: cada navegador usa a sua.
+    """
+
+    def __init__(self):
+        self.n = -1
+        self.pais_frente: List[int] = []
+        self.dist_frente: List[int] = []
+        self.pais_tras: List[int] = []
+        self.dist_tras: List[int] = []
+
+    def preparar(self, n: int):
+        """Garante vetores de tamanho `n`, todos a -1."""
+        if self.n != n:
+            self.n = n
+            self.pais_frente, self.dist_frente = [-1] * n, [-1] * n
+            self.pais_tras, self.dist_tras = [-1] * n, [-1] * n
+
+    def limpar(self, visitados: List[int]):
+        for i in visitados:
+            self.pais_frente[i] = self.dist_frente[i] = -1
+            self.pais_tras[i] = self.dist_tras[i] = -1
+
+
+def bfs_bidirecional_csr(csr: GrafoCSR, origem: int, destino: int,
+                         memoria: Optional[MemoriaBFS] = None) -> Optional[List[int]]:
+    """BFS bidirecional: expande, camada a camada, a fronteira mais pequena.
+
+    A frente usa as adjacências diretas e a de trás as invertidas. Quando as duas
+    procuras se encontram, termina-se a camada atual e escolhe-se o ponto de
+    encontro com menor número total de arestas, o que garante um caminho mínimo.
+
+    Args:
+        memoria: Vetores de trabalho a reutilizar (opcional)
+
+    Returns:
+        Lista de índices de `origem` até `destino`, ou None se não houver caminho
+    """
+    if origem == destino:
+        return [origem]
+
+    if memoria is None:
+        memoria = MemoriaBFS()
+    memoria.preparar(len(csr))
+    pais_frente, dist_frente = memoria.pais_frente, memoria.dist_frente
+    pais_tras, dist_tras = memoria.pais_tras, memoria.dist_tras
+
+    pais_frente[origem], dist_frente[origem] = origem, 0
+    pais_tras[destino], dist_tras[destino] = destino, 0
+
+    fronteira_frente = [origem]
+    fronteira_tras = [destino]
+    visitados = [origem, destino]
+
+    try:
+        while fronteira_frente and fronteira_tras:
+            if len(fronteira_frente) <= len(fronteira_tras):
+                fronteira_frente, encontro = _expandir_camada(
+                    csr.indptr, csr.indices, fronteira_frente,
+                    pais_frente, dist_frente, dist_tras)
+                visitados.extend(fronteira_frente)
+            else:
+                fronteira_tras, encontro = _expandir_camada(
+                    csr.indptr_inv, csr.indices_inv, fronteira_tras,
+                    pais_tras, dist_tras, dist_frente)
+                visitados.extend(fronteira_tras)
+
+            if encontro != -1:
+                caminho = [encontro]
+                no = encontro
+                while pais_frente[no] != no:
+                    no = pais_frente[no]
+                    caminho.append(no)
+                caminho.reverse()
+
+                no = encontro
+                while pais_tras[no] != no:
+                    no = pais_tras[no]
+                    caminho.append(no)
+                return caminho
+
+        return None
+    finally:
+        memoria.limpar(visitados)
+
+
+def _expandir_camada(indptr: List[int], indices: List[int], fronteira: List[int],
+                     pais: List[int], dist: List[int], dist_outro: List[int]):
+    """Expande uma camada completa; devolve (nova_fronteira, melhor_encontro ou -1)."""
+    nova_fronteira = []
+    melhor_encontro = -1
+    melhor_total = 2 * len(pais) + 1  # maior do que qualquer caminho simples
+
+    for u in fronteira:
+        d = dist[u] + 1
+        for w in indices[indptr[u]:indptr[u + 1]]:
+            if pais[w] != -1:
+                continue
+            pais[w] = u
+            dist[w] = d
+            if dist_outro[w] != -1 and d + dist_outro[w] < melhor_total:
+                melhor_total = d + dist_outro[w]
+                melhor_encontro = w
+            nova_fronteira.append(w)
+
+    return nova_fronteira, melhor_encontro
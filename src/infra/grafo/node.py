@@ -1,3 +1,4 @@
+import sys
 from enum import Enum
 
 
@@ -17,7 +18,9 @@ class Node:
             y: float = None,
             atratividade=0):
         self.m_id = id
-        self.m_name = str(name)
+        # Nome internado: as chaves do grafo e dos dicionários/conjuntos das
+        # procuras partilham o mesmo objeto (hash já calculado, comparação por identidade)
+        self.m_name = sys.intern(str(name))
         self.m_tipo = tipo
         self.m_atratividade = atratividade
         # Coordenadas opcionais para visualização
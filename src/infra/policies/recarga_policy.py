@@ -100,12 +100,12 @@ class RecargaPolicy(ABC):
         tipo_posto = veiculo.tipo_posto_necessario()
 
         for posto_nome in postos:
-            rota = navegador.calcular_rota(grafo, veiculo.localizacao_atual, posto_nome)
+            rota, distancia = navegador.calcular_rota_em_cache(
+                grafo, veiculo.localizacao_atual, posto_nome)
 
             if not rota or len(rota) < 2:
                 continue
 
-            distancia = grafo.calcular_distancia_rota(rota)
             if distancia is None or distancia >= distancia_minima:
                 continue
 
@@ -288,12 +288,12 @@ class RecargaDuranteViagemPolicy(RecargaPolicy):
                 continue
 
             # Calcular rota até o posto
-            rota = navegador.calcular_rota(grafo, veiculo.localizacao_atual, posto_nome)
+            rota, distancia = navegador.calcular_rota_em_cache(
+                grafo, veiculo.localizacao_atual, posto_nome)
 
             if not rota or len(rota) < 2:
                 continue
 
-            distancia = grafo.calcular_distancia_rota(rota)
             if distancia is None:
                 continue
 
@@ -261,7 +261,7 @@ class ReposicionamentoEstatistico(ReposicionamentoPolicy):
         historico = []
         
         # pedidos que foram atendidos ou estão em curso dentro da janela
-        for pedido in ambiente.listar_pedidos():
+        for pedido in ambiente.iter_pedidos():
             if pedido.estado in (EstadoPedido.EM_CURSO, EstadoPedido.CONCLUIDO):
                 if janela_inicio <= pedido.horario_pretendido <= tempo_simulacao:
                     historico.append((pedido.horario_pretendido, str(pedido.origem)))
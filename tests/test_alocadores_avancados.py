@@ -1,10 +1,13 @@
+import pytest
+
 from infra.grafo.grafo import Grafo
 from infra.grafo.node import Node
-from infra.grafo.aresta import Aresta
+from infra.grafo.aresta import Aresta, NivelTransito
 from infra.entidades.pedidos import Pedido
-from infra.entidades.veiculos import VeiculoCombustao
+from infra.entidades.veiculos import VeiculoCombustao, VeiculoEletrico
 from algoritmos.algoritmos_navegacao import NavegadorBFS
-from algoritmos.algoritmos_alocacao import AlocadorPorCusto, AlocadorAEstrela
+from algoritmos.algoritmos_alocacao import AlocadorPorCusto, AlocadorAEstrela, AlocadorHeuristico
+from algoritmos.criterios import CustoTempoPercurso
 from datetime import datetime
 
 
@@ -57,3 +60,122 @@ def test_alocador_aestrela_prefers_best_estimated_cost():
 
     # Both vehicles are similar; A* style selection should choose the one with lower g+h
     assert escolhido in (v1, v2)
+
+
+def test_alocador_aestrela_escolhe_veiculo_com_acidente_na_rota_do_pedido():
+    g = _build_chain_graph()
+    g.alterarTransitoAresta('CD', NivelTransito.ACIDENTE)
+
+    # Com o custo em tempo, todos os veículos ficam com score infinito
+    v1 = VeiculoCombustao(1, 100, 100, 4, 0.5, localizacao_atual='B')
+    v2 = VeiculoCombustao(2, 100, 100, 4, 0.4, localizacao_atual='C')
+    pedido = Pedido(1, 'A', 'D', 1, datetime.now())
+
+    al = AlocadorAEstrela(NavegadorBFS(), funcao_custo=CustoTempoPercurso())
+    assert al.escolher_veiculo(pedido, [v1, v2], g, ['A', 'B', 'C', 'D'], 3.0) is v1
+
+
+def test_alocador_heuristico_prefers_closer_vehicle():
+    g = _build_chain_graph()
+    nav = NavegadorBFS()
+
+    v1 = VeiculoCombustao(1, 100, 100, 4, 0.5, localizacao_atual='C')
+    v2 = VeiculoCombustao(2, 100, 100, 4, 0.5, localizacao_atual='B')
+
+    pedido = Pedido(1, 'A', 'D', 1, datetime.now())
+
+    al = AlocadorHeuristico(nav)
+    escolhido = al.escolher_veiculo(pedido, [v1, v2], g, ['A', 'B', 'C', 'D'], 3.0)
+
+    assert escolhido is v2
+    assert escolhido.rota_ate_cliente == ['B', 'A']
+    assert escolhido.distancia_ate_cliente == 1.0
+
+
+def test_alocador_heuristico_penaliza_combustao_para_pedido_eco():
+    g = _build_chain_graph()
+    nav = NavegadorBFS()
+
+    # Mesma posição e autonomia: só a preferência ambiental os distingue
+    v1 = VeiculoCombustao(1, 100, 100, 4, 0.5, localizacao_atual='B')
+    v2 = VeiculoEletrico(2, 100, 100, 4, 0.5, 2, localizacao_atual='B')
+
+    pedido = Pedido(1, 'A', 'D', 1, datetime.now(), preferencia_ambiental="eco")
+
+    al = AlocadorHeuristico(nav)
+    assert al.escolher_veiculo(pedido, [v1, v2], g, ['A', 'B', 'C', 'D'], 3.0) is v2
+
+
+def test_alocadores_ignoram_veiculos_sem_lugares_livres():
+    g = _build_chain_graph()
+    nav = NavegadorBFS()
+
+    # v1 está mais perto mas só tem 1 lugar livre; o pedido é para 2 passageiros
+    v1 = VeiculoCombustao(1, 100, 100, 4, 0.1, numero_passageiros=3, localizacao_atual='B')
+    v2 = VeiculoCombustao(2, 100, 100, 4, 0.5, localizacao_atual='C')
+
+    pedido = Pedido(1, 'A', 'D', 2, datetime.now())
+
+    for al in (AlocadorHeuristico(nav), AlocadorPorCusto(nav), AlocadorAEstrela(nav)):
+        assert al.escolher_veiculo(pedido, [v1, v2], g, ['A', 'B', 'C', 'D'], 3.0) is v2
+
+
+def test_alocador_resolve_localizacao_dada_por_id():
+    g = _build_chain_graph()
+    nav = NavegadorBFS()
+
+    id_b = g.get_node_by_name('B').getId()
+    v1 = VeiculoCombustao(1, 100, 100, 4, 0.5, localizacao_atual=id_b)
+    assert v1.localizacao_atual_nome is None
+
+    pedido = Pedido(1, 'A', 'D', 1, datetime.now())
+    escolhido = AlocadorPorCusto(nav).escolher_veiculo(pedido, [v1], g, ['A', 'B', 'C', 'D'], 3.0)
+
+    assert escolhido is v1
+    assert escolhido.rota_ate_cliente == ['B', 'A']
+
+
+def test_alocador_aestrela_calcula_custo_do_pedido_uma_vez():
+    from algoritmos.funcoes_custo import CustoTempoPercurso
+
+    class CustoContado(CustoTempoPercurso):
+        def __init__(self):
+            super().__init__()
+            self.chamadas = []
+
+        def custo_rota(self, grafo, rota, veiculo=None):
+            self.chamadas.append(list(rota))
+            return super().custo_rota(grafo, rota, veiculo)
+
+    g = _build_chain_graph()
+    custo = CustoContado()
+    rota_pedido = ['A', 'B', 'C', 'D']
+
+    v1 = VeiculoCombustao(1, 100, 100, 4, 0.5, localizacao_atual='B')
+    v2 = VeiculoCombustao(2, 100, 100, 4, 0.4, localizacao_atual='C')
+    pedido = Pedido(1, 'A', 'D', 1, datetime.now())
+
+    al = AlocadorAEstrela(NavegadorBFS(), funcao_custo=custo)
+    assert al.escolher_veiculo(pedido, [v1, v2], g, rota_pedido, 3.0) is v1
+    assert custo.chamadas.count(rota_pedido) == 1
+
+
+def test_alocador_rejeita_navegador_sem_rotas_minimas():
+    from algoritmos.algoritmos_navegacao import NavegadorDFS
+
+    with pytest.raises(ValueError):
+        AlocadorPorCusto(NavegadorDFS())
+
+
+def test_alocadores_excluem_veiculos_sem_autonomia_com_margem():
+    g = _build_chain_graph()
+
+    # Rota até ao cliente (1 km) + pedido (3 km) + margem de segurança (5 km) = 9 km
+    sem_autonomia = VeiculoCombustao(1, 100, 8.5, 4, 0.1, localizacao_atual='B')
+    com_autonomia = VeiculoCombustao(2, 100, 9, 4, 0.5, localizacao_atual='B')
+    pedido = Pedido(1, 'A', 'D', 1, datetime.now())
+
+    for alocador in (AlocadorPorCusto, AlocadorAEstrela, AlocadorHeuristico):
+        escolhido = alocador(NavegadorBFS()).escolher_veiculo(
+            pedido, [sem_autonomia, com_autonomia], g, ['A', 'B', 'C', 'D'], 3.0)
+        assert escolhido is com_autonomia
@@ -0,0 +1,58 @@
+import queue
+import threading
+
+import pytest
+
+from display.aplicacao.queue_handler import CoalescingQueue
+
+
+def _drenar(fila):
+    mensagens = []
+    while True:
+        try:
+            mensagens.append(fila.get_nowait())
+        except queue.Empty:
+            return mensagens
+
+
+def test_update_time_pendente_e_substituido_pelo_mais_recente():
+    fila = CoalescingQueue()
+    fila.put({"type": "update_time", "tempo": 1})
+    fila.put({"type": "reject"})
+    fila.put({"type": "update_time", "tempo": 2})
+    fila.put({"type": "log", "message": "x"})
+
+    mensagens = _drenar(fila)
+
+    # O snapshot mantém a posição do primeiro, mas com o conteúdo do último
+    assert [m["type"] for m in mensagens] == ["update_time", "reject", "log"]
+    assert mensagens[0]["tempo"] == 2
+
+
+def test_update_time_depois_de_lido_volta_a_ser_enfileirado():
+    fila = CoalescingQueue()
+    fila.put({"type": "update_time", "tempo": 1})
+    assert fila.get_nowait()["tempo"] == 1
+
+    fila.put({"type": "update_time", "tempo": 2})
+    assert fila.get_nowait()["tempo"] == 2
+    with pytest.raises(queue.Empty):
+        fila.get_nowait()
+
+
+def test_join_termina_quando_todas_as_mensagens_lidas_tem_task_done():
+    fila = CoalescingQueue()
+    fila.put({"type": "update_time", "tempo": 1})
+    fila.put({"type": "update_time", "tempo": 2})
+    fila.put({"type": "log", "message": "x"})
+
+    # Só há duas mensagens para ler: as duas update_time foram fundidas
+    for _ in _drenar(fila):
+        fila.task_done()
+
+    t = threading.Thread(target=fila.join, daemon=True)
+    t.start()
+    t.join(timeout=1.0)
+    assert not t.is_alive()
+    with pytest.raises(ValueError):
+        fila.task_done()
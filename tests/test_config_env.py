@@ -76,3 +76,30 @@ def test_get_new_alocadores_available_and_receive_params():
     al_a = Config.get_alocador(nav, 'aestrela', func, heur)
     assert al_a.funcao_custo is func
     assert al_a.heuristica is heur
+
+
+def test_get_alocador_com_dfs_avalia_veiculos_com_custo_uniforme(capsys):
+    from algoritmos.algoritmos_navegacao import NavegadorDFS, NavegadorCustoUniforme
+
+    nav = NavegadorDFS()
+    al = Config.get_alocador(nav, 'custo')
+
+    assert isinstance(al.navegador, NavegadorCustoUniforme)
+    assert al.navegador.funcao_custo is nav.funcao_custo
+    assert 'Custo Uniforme' in capsys.readouterr().out
+
+
+def test_funcao_custo_e_heuristica_sao_instancias_novas():
+    # Cada chamada devolve uma instância nova (sem estado partilhado entre execuções)
+    h1, h2 = Config.get_heuristica('euclidiana'), Config.get_heuristica('euclidiana')
+    assert isinstance(h1, HeuristicaEuclidiana) and h1 is not h2
+    assert isinstance(Config.get_funcao_custo('TEMPO'), CustoTempoPercurso)
+
+
+def test_criterios_exporta_todas_as_classes():
+    import algoritmos.criterios as criterios
+    from algoritmos import funcoes_custo
+
+    assert all(hasattr(criterios, nome) for nome in criterios.__all__)
+    assert 'CustoAmbientalTempo' in criterios.__all__
+    assert criterios.CustoDefault is funcoes_custo.CustoDefault
@@ -0,0 +1,51 @@
+import os
+
+import networkx as nx
+
+from display.aplicacao import layout_utils
+
+
+def test_layout_reutilizado_da_cache_e_invalidado_quando_grafo_muda(tmp_path, monkeypatch):
+    monkeypatch.setattr(layout_utils, "LAYOUT_CACHE_DIR", str(tmp_path))
+    chamadas = []
+
+    def layout(G, scale):
+        chamadas.append(scale)
+        return {n: (float(i) * scale, 0.0) for i, n in enumerate(G.nodes())}
+
+    G = nx.path_graph(["A", "B", "C"])
+    primeiro = layout_utils.load_or_compute_layout(G, layout, "teste", scale=2.0)
+    segundo = layout_utils.load_or_compute_layout(G, layout, "teste", scale=2.0)
+
+    assert chamadas == [2.0]
+    assert segundo == primeiro
+
+    # Outra escala ou outra topologia não reutilizam o layout guardado
+    layout_utils.load_or_compute_layout(G, layout, "teste", scale=3.0)
+    G.add_edge("C", "D")
+    layout_utils.load_or_compute_layout(G, layout, "teste", scale=2.0)
+    assert chamadas == [2.0, 3.0, 2.0]
+
+
+def test_layout_recalculado_se_ficheiro_da_cache_estiver_truncado(tmp_path, monkeypatch):
+    monkeypatch.setattr(layout_utils, "LAYOUT_CACHE_DIR", str(tmp_path))
+    chamadas = []
+
+    def layout(G, scale):
+        chamadas.append(scale)
+        return {n: (float(i), 0.0) for i, n in enumerate(G.nodes())}
+
+    G = nx.path_graph(["A", "B", "C"])
+    esperado = layout_utils.load_or_compute_layout(G, layout, "teste", scale=1.0)
+
+    # Só fica o ficheiro final (o temporário da escrita foi movido)
+    (ficheiro,) = os.listdir(tmp_path)
+    assert ficheiro.endswith(".npz")
+    caminho = tmp_path / ficheiro
+    caminho.write_bytes(caminho.read_bytes()[:20])
+
+    assert layout_utils.load_or_compute_layout(G, layout, "teste", scale=1.0) == esperado
+    assert chamadas == [1.0, 1.0]
+    # O ficheiro corrompido foi substituído por um válido
+    assert layout_utils.load_or_compute_layout(G, layout, "teste", scale=1.0) == esperado
+    assert chamadas == [1.0, 1.0]
@@ -1,7 +1,9 @@
+import random
+
 from infra.grafo.grafo import Grafo
 from infra.grafo.node import Node
 from infra.grafo.aresta import Aresta
-from algoritmos.algoritmos_navegacao import NavegadorBidirecional
+from algoritmos.algoritmos_navegacao import NavegadorBFS, NavegadorBidirecional
 
 
 def _build_chain_graph():
@@ -52,3 +54,54 @@ def test_bidirecional_no_path_returns_none():
 
     nav = NavegadorBidirecional()
     assert nav.calcular_rota(g, 'A', 'D') is None
+
+
+def test_bidirecional_grafo_dirigido_segue_predecessores():
+    g = Grafo(directed=True)
+    nA, nB, nC, nD = Node('A'), Node('B'), Node('C'), Node('D')
+    g.add_edge(nA, nB, Aresta(1, 1, 'AB'))
+    g.add_edge(nB, nC, Aresta(1, 1, 'BC'))
+    g.add_edge(nC, nD, Aresta(1, 1, 'CD'))
+
+    nav = NavegadorBidirecional()
+    assert nav.calcular_rota(g, 'A', 'D') == ['A', 'B', 'C', 'D']
+    # No sentido contrário das arestas não há caminho
+    assert nav.calcular_rota(g, 'D', 'A') is None
+
+
+def test_bidirecional_numero_minimo_de_arestas_como_bfs():
+    rng = random.Random(3)
+    for directed in (False, True):
+        for _ in range(30):
+            g = Grafo(directed=directed)
+            nos = [Node(f'N{i}') for i in range(25)]
+            for i in range(60):
+                a, b = rng.sample(nos, 2)
+                g.add_edge(a, b, Aresta(1, 1, f'E{i}'))
+
+            origem, destino = rng.sample([n.getName() for n in g.getNodes()], 2)
+            rota = NavegadorBidirecional().calcular_rota(g, origem, destino)
+            esperado = NavegadorBFS().calcular_rota(g, origem, destino)
+            if esperado is None:
+                assert rota is None
+            else:
+                assert len(rota) == len(esperado)
+                assert rota[0] == origem and rota[-1] == destino
+                assert all(g.getEdge(u, v) is not None for u, v in zip(rota, rota[1:]))
+
+
+def test_predecessores_reutilizados_e_reconstruidos_apos_add_edge():
+    g = Grafo(directed=True)
+    nA, nB, nC = Node('A'), Node('B'), Node('C')
+    g.add_edge(nA, nB, Aresta(1, 1, 'AB'))
+    g.add_edge(nB, nC, Aresta(1, 1, 'BC'))
+
+    preds = g.get_predecessores()
+    assert g.get_predecessores() is preds
+    assert [n for (n, _) in preds['C']] == ['B']
+
+    nav = NavegadorBidirecional()
+    assert nav.calcular_rota(g, 'C', 'A') is None
+    g.add_edge(nC, nA, Aresta(1, 1, 'CA'))
+    assert nav.calcular_rota(g, 'C', 'A') == ['C', 'A']
+    assert [n for (n, _) in g.get_predecessores()['A']] == ['C']
@@ -0,0 +1,391 @@
+"""
+Testes dos navegadores base (BFS/DFS): caminhos válidos, casos limite e ausência de caminho.
+"""
+import random
+
+import pytest
+
+from infra.grafo.grafo import Grafo
+from infra.grafo.grafo_csr import bfs_csr_inversa
+from infra.grafo.node import Node
+from infra.grafo.aresta import Aresta, NivelTransito
+from algoritmos.algoritmos_navegacao import (
+    NavegadorBFS, NavegadorDFS, NavegadorCH, NavegadorCustoUniforme, NavegadorAEstrela, NavegadorGreedy)
+from algoritmos.criterios import CustoDefault, CustoTempoPercurso, HeuristicaEuclidiana
+
+
+def _build_diamond_graph():
+    """A liga a D por dois caminhos (A-B-D e A-C-E-D)."""
+    g = Grafo(directed=False)
+    nA, nB, nC, nD, nE = Node('A'), Node('B'), Node('C'), Node('D'), Node('E')
+
+    g.add_edge(nA, nB, Aresta(1, 1, 'AB'))
+    g.add_edge(nB, nD, Aresta(1, 1, 'BD'))
+    g.add_edge(nA, nC, Aresta(1, 1, 'AC'))
+    g.add_edge(nC, nE, Aresta(1, 1, 'CE'))
+    g.add_edge(nE, nD, Aresta(1, 1, 'ED'))
+
+    return g
+
+
+def _rota_valida(g, rota):
+    return all(g.getEdge(u, v) is not None for u, v in zip(rota, rota[1:]))
+
+
+def test_bfs_menor_numero_de_arestas():
+    g = _build_diamond_graph()
+    rota = NavegadorBFS().calcular_rota(g, 'A', 'D')
+    assert rota == ['A', 'B', 'D']
+
+
+def test_bfs_origem_igual_destino():
+    g = _build_diamond_graph()
+    assert NavegadorBFS().calcular_rota(g, 'C', 'C') == ['C']
+
+
+def test_bfs_sem_caminho_retorna_none():
+    g = _build_diamond_graph()
+    g.add_edge(Node('X'), Node('Y'), Aresta(1, 1, 'XY'))
+    assert NavegadorBFS().calcular_rota(g, 'A', 'Y') is None
+
+
+def test_bfs_dataset_rota_valida():
+    g = Grafo.from_json_file('dataset/grafo.json')
+    nomes = [n.getName() for n in g.getNodes()]
+    rota = NavegadorBFS().calcular_rota(g, nomes[0], nomes[-1])
+    assert rota is not None
+    assert rota[0] == nomes[0] and rota[-1] == nomes[-1]
+    assert _rota_valida(g, rota)
+
+
+def test_dfs_segue_primeiro_ramo():
+    g = _build_diamond_graph()
+    # O primeiro vizinho de A é B, e B liga diretamente a D
+    assert NavegadorDFS().calcular_rota(g, 'A', 'D') == ['A', 'B', 'D']
+
+
+def test_dfs_sem_caminho_retorna_none():
+    g = _build_diamond_graph()
+    g.add_edge(Node('X'), Node('Y'), Aresta(1, 1, 'XY'))
+    assert NavegadorDFS().calcular_rota(g, 'A', 'Y') is None
+
+
+def test_dfs_cadeia_longa_sem_recursion_error():
+    g = Grafo(directed=False)
+    nos = [Node(f'N{i}') for i in range(1500)]
+    for i in range(len(nos) - 1):
+        g.add_edge(nos[i], nos[i + 1], Aresta(1, 1, f'E{i}'))
+
+    rota = NavegadorDFS().calcular_rota(g, 'N0', 'N1499')
+    assert rota is not None and len(rota) == 1500
+
+
+def test_bfs_reflete_arestas_adicionadas_depois_da_primeira_procura():
+    g = _build_diamond_graph()
+    nav = NavegadorBFS()
+    assert nav.calcular_rota(g, 'A', 'E') == ['A', 'C', 'E']
+
+    # Nova aresta direta deve invalidar a representação CSR em cache
+    g.add_edge(g.get_node_by_name('A'), g.get_node_by_name('E'), Aresta(1, 1, 'AE'))
+    assert nav.calcular_rota(g, 'A', 'E') == ['A', 'E']
+
+
+def test_cache_rotas_reutiliza_e_devolve_distancia():
+    g = _build_diamond_graph()
+    nav = NavegadorBFS()
+
+    rota, distancia = nav.calcular_rota_em_cache(g, 'A', 'E')
+    assert rota == ['A', 'C', 'E'] and distancia == 2.0
+    assert nav.calcular_rota_em_cache(g, 'A', 'E')[0] is rota
+
+
+def test_cache_rotas_invalida_quando_grafo_muda():
+    g = _build_diamond_graph()
+    nav = NavegadorBFS()
+    rota_antes, _ = nav.calcular_rota_em_cache(g, 'A', 'E')
+
+    g.add_edge(g.get_node_by_name('A'), g.get_node_by_name('E'), Aresta(1, 1, 'AE'))
+    assert nav.calcular_rota_em_cache(g, 'A', 'E')[0] == ['A', 'E']
+
+    versao = g.versao
+    g.alterarTransitoAresta('AE', NivelTransito.ELEVADO)
+    assert g.versao == versao + 1
+    assert nav.calcular_rota_em_cache(g, 'A', 'E')[0] is not rota_antes
+
+
+def test_cache_rotas_nao_mistura_grafos_com_a_mesma_versao():
+    g1, g2 = _build_diamond_graph(), _build_diamond_graph()
+    g2.add_edge(g2.get_node_by_name('A'), g2.get_node_by_name('E'), Aresta(1, 1, 'AE'))
+    g1.add_edge(g1.get_node_by_name('B'), g1.get_node_by_name('C'), Aresta(1, 1, 'BC'))
+    assert g1.versao == g2.versao
+
+    nav = NavegadorBFS()
+    assert nav.calcular_rota_em_cache(g1, 'A', 'E') == (['A', 'C', 'E'], 2)
+    assert nav.calcular_rota_em_cache(g2, 'A', 'E') == (['A', 'E'], 1)
+
+
+def test_cache_rotas_sem_caminho():
+    g = _build_diamond_graph()
+    g.add_edge(Node('X'), Node('Y'), Aresta(1, 1, 'XY'))
+    assert NavegadorBFS().calcular_rota_em_cache(g, 'A', 'Y') == (None, None)
+
+
+def test_rotas_para_destino_varias_origens():
+    g = _build_diamond_graph()
+    rotas = NavegadorBFS().calcular_rotas_para_destino(g, 'D', ['A', 'E', 'D'])
+
+    assert rotas['A'] == (['A', 'B', 'D'], 2.0)
+    assert rotas['E'] == (['E', 'D'], 1.0)
+    assert rotas['D'] == (['D'], 0.0)
+
+
+def test_rotas_para_destino_grafo_dirigido_usa_predecessores():
+    g = Grafo(directed=True)
+    nA, nB, nC = Node('A'), Node('B'), Node('C')
+    g.add_edge(nA, nB, Aresta(1, 1, 'AB'))
+    g.add_edge(nB, nC, Aresta(1, 1, 'BC'))
+
+    for nav in (NavegadorBFS(), NavegadorDFS()):
+        rotas = nav.calcular_rotas_para_destino(g, 'C', ['A', 'B'])
+        assert rotas['A'][0] == ['A', 'B', 'C']
+        assert rotas['B'][0] == ['B', 'C']
+        # No sentido contrário não há caminho
+        assert nav.calcular_rotas_para_destino(g, 'A', ['C'])['C'] == (None, None)
+
+
+def test_bfs_bidirecional_numero_minimo_de_arestas_em_grafos_aleatorios():
+    rng = random.Random(7)
+    for directed in (False, True):
+        for _ in range(30):
+            g = Grafo(directed=directed)
+            nos = [Node(f'N{i}') for i in range(25)]
+            for i in range(60):
+                a, b = rng.sample(nos, 2)
+                g.add_edge(a, b, Aresta(1, 1, f'E{i}'))
+
+            csr = g.get_csr()
+            origem, destino = rng.sample(list(csr.name_to_idx), 2)
+            # Referência: a BFS invertida usada por calcular_rotas_para_destino
+            pais = bfs_csr_inversa(csr, csr.indice(destino), {csr.indice(origem)})
+
+            rota = NavegadorBFS().calcular_rota(g, origem, destino)
+            if pais[csr.indice(origem)] == -1:
+                assert rota is None
+            else:
+                esperado = csr.caminho_ate_raiz(pais, csr.indice(origem))
+                assert len(rota) == len(esperado)
+                assert rota[0] == origem and rota[-1] == destino
+                assert _rota_valida(g, rota)
+
+
+def test_ch_mesmo_custo_que_ucs_em_grafos_aleatorios():
+    rng = random.Random(11)
+    for directed in (False, True):
+        for _ in range(20):
+            g = Grafo(directed=directed)
+            nos = [Node(f'N{i}') for i in range(30)]
+            # Sem arestas paralelas: getEdge (usado para medir a rota) devolve a primeira
+            pares = set()
+            for i in range(80):
+                a, b = rng.sample(nos, 2)
+                par = (a, b) if directed else frozenset((a, b))
+                if par in pares:
+                    continue
+                pares.add(par)
+                g.add_edge(a, b, Aresta(rng.randint(1, 20), 50, f'E{i}'))
+
+            ch, ucs = NavegadorCH(), NavegadorCustoUniforme()
+            nomes = list(g.get_csr().name_to_idx)
+            for _ in range(10):
+                origem, destino = rng.sample(nomes, 2)
+                rota = ch.calcular_rota(g, origem, destino)
+                esperado = ucs.calcular_rota(g, origem, destino)
+                if esperado is None:
+                    assert rota is None
+                else:
+                    assert rota[0] == origem and rota[-1] == destino
+                    assert _rota_valida(g, rota)
+                    assert g.calcular_distancia_rota(rota) == g.calcular_distancia_rota(esperado)
+
+
+def test_ch_reconstroi_quando_grafo_muda():
+    g = _build_diamond_graph()
+    nav = NavegadorCH()
+    assert nav.calcular_rota(g, 'A', 'E') == ['A', 'C', 'E']
+
+    g.add_edge(g.get_node_by_name('A'), g.get_node_by_name('E'), Aresta(1, 1, 'AE'))
+    assert nav.calcular_rota(g, 'A', 'E') == ['A', 'E']
+
+
+def test_ch_so_reconstroi_quando_os_custos_mudam():
+    g = _build_diamond_graph()
+
+    # O custo em km ignora o trânsito: a hierarquia mantém-se
+    nav = NavegadorCH()
+    assert nav.calcular_rota(g, 'A', 'D') == ['A', 'B', 'D']
+    ch = nav._ch
+    g.alterarTransitoAresta('BD', NivelTransito.ACIDENTE)
+    assert nav.calcular_rota(g, 'A', 'D') == ['A', 'B', 'D']
+    assert nav._ch is ch
+    g.alterarTransitoAresta('BD', NivelTransito.NORMAL)
+
+    # O custo em tempo muda com o acidente: a hierarquia é reconstruída
+    nav = NavegadorCH(CustoTempoPercurso())
+    assert nav.calcular_rota(g, 'A', 'D') == ['A', 'B', 'D']
+    g.alterarTransitoAresta('BD', NivelTransito.ACIDENTE)
+    assert nav.calcular_rota(g, 'A', 'D') == ['A', 'C', 'E', 'D']
+
+
+def test_ch_nao_reutiliza_hierarquia_de_outro_grafo():
+    g1, g2 = _build_diamond_graph(), _build_diamond_graph()
+    g2.add_edge(g2.get_node_by_name('A'), g2.get_node_by_name('E'), Aresta(1, 1, 'AE'))
+    g1.add_edge(g1.get_node_by_name('B'), g1.get_node_by_name('C'), Aresta(1, 1, 'BC'))
+    assert g1.versao == g2.versao
+
+    nav = NavegadorCH()
+    assert nav.calcular_rota(g1, 'A', 'E') == ['A', 'C', 'E']
+    assert nav.calcular_rota(g2, 'A', 'E') == ['A', 'E']
+
+
+def test_bfs_memoria_reutilizada_fica_limpa_entre_consultas():
+    g = _build_diamond_graph()
+    nav = NavegadorBFS()
+
+    assert nav.calcular_rota(g, 'A', 'D') == ['A', 'B', 'D']
+    assert all(p == -1 for p in nav._memoria.pais_frente + nav._memoria.pais_tras)
+    assert nav.calcular_rota(g, 'E', 'B') == ['E', 'D', 'B']
+
+
+def test_ucs_aestrela_greedy_reconstroem_rotas_pelos_predecessores():
+    # Como o losango, mas A-B-D (11 km) é mais caro do que A-C-E-D (3 km)
+    g = Grafo(directed=False)
+    nA, nB, nC, nD, nE = Node('A'), Node('B'), Node('C'), Node('D'), Node('E')
+    g.add_edge(nA, nB, Aresta(1, 1, 'AB'))
+    g.add_edge(nB, nD, Aresta(10, 1, 'BD'))
+    g.add_edge(nA, nC, Aresta(1, 1, 'AC'))
+    g.add_edge(nC, nE, Aresta(1, 1, 'CE'))
+    g.add_edge(nE, nD, Aresta(1, 1, 'ED'))
+
+    assert NavegadorCustoUniforme().calcular_rota(g, 'A', 'D') == ['A', 'C', 'E', 'D']
+    assert NavegadorAEstrela().calcular_rota(g, 'A', 'D') == ['A', 'C', 'E', 'D']
+
+    rota = NavegadorGreedy().calcular_rota(g, 'A', 'D')
+    assert rota[0] == 'A' and rota[-1] == 'D' and _rota_valida(g, rota)
+    assert NavegadorGreedy().calcular_rota(g, 'A', 'A') == ['A']
+
+
+def test_distancia_rota_vetorial_igual_a_soma_das_arestas():
+    g = Grafo.from_json_file('dataset/grafo.json')
+    nomes = [n.getName() for n in g.getNodes()]
+    rota = NavegadorBFS().calcular_rota(g, nomes[0], nomes[-1])
+
+    esperado = sum(g.getEdge(u, v).getQuilometro() for u, v in zip(rota, rota[1:]))
+    assert g.calcular_distancia_rota(rota) == pytest.approx(esperado)
+    assert CustoDefault().custo_rota(g, rota) == pytest.approx(esperado)
+    # Nós desconhecidos caem no cálculo aresta a aresta
+    assert g.calcular_distancia_rota(rota + ['?']) == pytest.approx(esperado)
+
+
+def test_ucs_aestrela_csr_refletem_transito_depois_da_primeira_procura():
+    g = _build_diamond_graph()
+    for nav in (NavegadorCustoUniforme(CustoTempoPercurso()), NavegadorAEstrela(CustoTempoPercurso())):
+        assert nav.calcular_rota(g, 'A', 'D') == ['A', 'B', 'D']
+
+        # Os custos das arestas em cache têm de ser recalculados após o acidente
+        g.alterarTransitoAresta('BD', NivelTransito.ACIDENTE)
+        assert nav.calcular_rota(g, 'A', 'D') == ['A', 'C', 'E', 'D']
+        g.alterarTransitoAresta('BD', NivelTransito.NORMAL)
+
+
+def test_heuristica_euclidiana_memoriza_por_destino():
+    g = Grafo(directed=False)
+    nA, nB, nC = Node('A', x=0, y=0), Node('B', x=3, y=4), Node('C', x=6, y=8)
+    g.add_edge(nA, nB, Aresta(5, 1, 'AB'))
+    g.add_edge(nB, nC, Aresta(5, 1, 'BC'))
+    h = HeuristicaEuclidiana()
+
+    assert h.estimativa(g, 'A', 'C') == 10.0
+    assert h.estimativa(g, 'B', 'C') == 5.0
+    # Mudar de destino invalida as estimativas memorizadas
+    assert h.estimativa(g, 'A', 'B') == 5.0
+    assert h.estimativa(g, 'A', '?') == 0.0
+
+
+def test_heuristica_euclidiana_nao_mistura_grafos():
+    g1, g2 = Grafo(directed=False), Grafo(directed=False)
+    g1.add_edge(Node('A', x=0, y=0), Node('B', x=3, y=4), Aresta(5, 1, 'AB'))
+    g2.add_edge(Node('A', x=0, y=0), Node('B', x=6, y=8), Aresta(10, 1, 'AB'))
+    h = HeuristicaEuclidiana()
+
+    assert h.estimativa(g1, 'A', 'B') == 5.0
+    assert h.estimativa(g2, 'A', 'B') == 10.0
+
+
+def test_custo_tempo_rota_vetorial_reflete_transito():
+    g = _build_diamond_graph()
+    custo = CustoTempoPercurso()
+    rota = ['A', 'C', 'E', 'D']
+
+    assert custo.custo_rota(g, rota) == 3.0
+    g.alterarTransitoAresta('CE', NivelTransito.ELEVADO)
+    assert custo.custo_rota(g, rota) == 3.5
+    g.alterarTransitoAresta('CE', NivelTransito.ACIDENTE)
+    assert custo.custo_rota(g, rota) == float('inf')
+
+
+def test_aresta_com_velocidade_zero_carrega_e_so_falha_ao_calcular_tempo():
+    aresta = Aresta(2, 0, 'XY')
+    assert aresta.km == 2.0
+    with pytest.raises(ZeroDivisionError):
+        aresta.getTempoPercorrer()
+    aresta.setNivelTransito(NivelTransito.ACIDENTE)
+    assert aresta.getTempoPercorrer() is None
+
+
+def test_custo_tempo_nao_mistura_grafos_com_a_mesma_versao():
+    g1, g2 = _build_diamond_graph(), _build_diamond_graph()
+    g1.alterarTransitoAresta('CE', NivelTransito.ELEVADO)
+    g2.alterarTransitoAresta('AB', NivelTransito.ELEVADO)
+    assert g1.versao == g2.versao
+    custo = CustoTempoPercurso()
+    rota = ['A', 'C', 'E', 'D']
+
+    # Os tempos das arestas ficam no CSR de cada grafo
+    assert custo.custo_rota(g1, rota) == 3.5
+    assert custo.custo_rota(g2, rota) == 3.0
+    assert custo.custo_rota(g1, rota) == 3.5
+
+
+def test_heuristica_euclidiana_estimativa_ordem_sem_raiz():
+    g = Grafo(directed=False)
+    nA, nB, nC = Node('A', x=0, y=0), Node('B', x=3, y=4), Node('C', x=6, y=8)
+    g.add_edge(nA, nB, Aresta(5, 1, 'AB'))
+    g.add_edge(nB, nC, Aresta(5, 1, 'BC'))
+    h = HeuristicaEuclidiana()
+
+    assert h.estimativa_ordem(g, 'A', 'C') == 100.0
+    assert h.estimativa(g, 'A', 'C') == 10.0
+    assert h.estimativa_ordem(g, 'B', 'C') < h.estimativa_ordem(g, 'A', 'C')
+    assert NavegadorGreedy(heuristica=h).calcular_rota(g, 'A', 'C') == ['A', 'B', 'C']
+
+
+def test_estimativas_por_no_iguais_as_individuais_e_aestrela_otimo():
+    g = Grafo.from_json_file('dataset/grafo.json')
+    h = HeuristicaEuclidiana()
+    csr = g.get_csr()
+    nomes = csr.idx_to_name
+    destino = nomes[-1]
+
+    todas = h.estimativas_por_no(g, destino)
+    for i, nome in enumerate(nomes):
+        assert todas[i] == pytest.approx(h.estimativa(g, nome, destino))
+
+    rota = NavegadorAEstrela(heuristica=h).calcular_rota(g, nomes[0], destino)
+    esperado = NavegadorCustoUniforme().calcular_rota(g, nomes[0], destino)
+    assert g.calcular_distancia_rota(rota) == pytest.approx(g.calcular_distancia_rota(esperado))
+
+
+def test_navegadores_partilham_criterios_por_omissao():
+    a, b = NavegadorBFS(), NavegadorCustoUniforme()
+    assert a.funcao_custo is b.funcao_custo
+    assert a.heuristica is b.heuristica
@@ -108,3 +108,18 @@ def test_multiple_node_overlap_not_collapsed_in_simple_logic():
 
     expected = ['A', 'B', 'C', 'D', 'E']
     assert v.rota_total_viagens() == expected
+
+
+def test_passa_por_considera_apenas_rota_restante():
+    v = new_vehicle()
+    trip = build_viagem(['A', 'B'], ['B', 'C', 'D'])
+    v.viagens.append(trip)
+    v.estado = EstadoVeiculo.EM_ANDAMENTO
+
+    assert v.passa_por('A') and v.passa_por('D')
+    assert not v.passa_por('X')
+
+    # Depois de avançar um segmento, 'A' já ficou para trás
+    trip.indice_segmento_atual = 1
+    assert not v.passa_por('A')
+    assert v.passa_por('B')